@@ -8,13 +8,14 @@ Client SDK 模块
 - Human 客户端
 """
 
-from .base import BaseClient
+from .base import BaseClient, MessageContext
 from .agent import AgentClient
 from .environment import EnvironmentClient
 from .human import HumanClient
 
 __all__ = [
     "BaseClient",
+    "MessageContext",
     "AgentClient",
     "EnvironmentClient",
     "HumanClient",
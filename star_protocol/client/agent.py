@@ -20,6 +20,9 @@ class AgentClient(BaseClient):
         env_id: str,
         hub_url: str,
         metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1,
+        batch_window_us: int = 500,
+        receive_concurrency: int = 1,
     ):
         super().__init__(
             client_id=agent_id,
@@ -27,6 +30,9 @@ class AgentClient(BaseClient):
             hub_url=hub_url,
             env_id=env_id,
             metadata=metadata,
+            batch_size=batch_size,
+            batch_window_us=batch_window_us,
+            receive_concurrency=receive_concurrency,
         )
         self.env_id = env_id
 
@@ -107,6 +113,7 @@ class AgentClient(BaseClient):
         parameters: Dict[str, Any],
         recipient: Optional[str] = None,
         timeout: Optional[float] = None,
+        wait_for_outcome: bool = True,
     ) -> Any:
         """发送动作并等待结果（使用上下文管理）
 
@@ -115,6 +122,7 @@ class AgentClient(BaseClient):
             parameters: 动作参数
             recipient: 目标环境ID，默认使用初始化时的 env_id
             timeout: 超时时间（秒）
+            wait_for_outcome: 是否等待结果，为 False 时不创建上下文
 
         Returns:
             OutcomeMessage: 动作结果
@@ -129,6 +137,7 @@ class AgentClient(BaseClient):
             params=parameters,
             recipient=recipient,
             timeout=timeout,
+            wait_for_outcome=wait_for_outcome,
         )
 
         return outcome
@@ -4,8 +4,10 @@ import asyncio
 import inspect
 import time
 import websockets
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Set
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
 from ..protocol import (
     Message,
     Envelope,
@@ -23,17 +25,28 @@ from ..utils import get_logger
 # 上下文管理器
 from .context import ClientContext
 
+# 共享的只读空元数据，避免每次访问都分配空字典
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
 
-# @dataclass
-# class MessageContext:
-#     """消息上下文，包含消息和相关元数据"""
 
-#     message: Message
-#     sender: Optional[str] = None
-#     recipient: Optional[str] = None
-#     envelope_type: Optional[EnvelopeType] = None
-#     timestamp: Optional[float] = None
-#     metadata: Dict[str, Any] = field(default_factory=dict)
+@dataclass(slots=True)
+class MessageContext:
+    """消息上下文，包含消息和相关元数据
+
+    metadata 默认为 None，仅在用户写入时才需要分配字典。
+    """
+
+    message: Message
+    sender: Optional[str] = None
+    recipient: Optional[str] = None
+    envelope_type: Optional[EnvelopeType] = None
+    timestamp: float = 0.0
+    metadata: Optional[Dict[str, Any]] = None
+
+    @property
+    def metadata_or_empty(self) -> Mapping[str, Any]:
+        """只读访问元数据，未设置时返回共享的只读空映射"""
+        return self.metadata if self.metadata is not None else _EMPTY_META
 
 
 class BaseClient:
@@ -64,6 +77,9 @@ class BaseClient:
         hub_url: str,
         env_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1,
+        batch_window_us: int = 500,
+        receive_concurrency: int = 1,
     ):
         self.client_info = ClientInfo(
             client_id=client_id,
@@ -83,11 +99,34 @@ class BaseClient:
 
         self.context = ClientContext(client_id=client_id)
 
+        # send_message 每次发送都相同的信封参数
+        self._envelope_proto_args = {
+            "envelope_type": EnvelopeType.MESSAGE,
+            "sender": client_id,
+        }
+
         # 用户自定义处理器（通过装饰器注册）
-        self._action_handlers: Dict[str, Callable] = {}
-        self._outcome_handlers: Dict[str, Callable] = {}
-        self._event_handlers: Dict[str, Callable] = {}
-        self._stream_handlers: Dict[str, Callable] = {}
+        # 按名称索引的处理器：name -> [handler, ...]
+        self._action_handlers_by_name: Dict[str, List[Callable]] = defaultdict(list)
+        self._outcome_handlers_by_name: Dict[str, List[Callable]] = defaultdict(list)
+        self._event_handlers_by_name: Dict[str, List[Callable]] = defaultdict(list)
+        self._stream_handlers_by_name: Dict[str, List[Callable]] = defaultdict(list)
+        # 未指定名称的处理器：处理所有消息
+        self._action_handlers_wild: List[Callable] = []
+        self._outcome_handlers_wild: List[Callable] = []
+        self._event_handlers_wild: List[Callable] = []
+        self._stream_handlers_wild: List[Callable] = []
+        # 是否有 ACTION 处理器接收 MessageContext（参数名为 ctx）
+        self._action_needs_ctx = False
+
+        # 信封类型 -> 处理方法（预先绑定，分发时无需再查找属性）
+        # 子类在类中重写 on_* 方法会自动生效；若在实例上替换 on_* 方法，
+        # 需要同步更新此字典
+        self._env_dispatch: Dict[EnvelopeType, Callable] = {
+            EnvelopeType.HEARTBEAT: self.on_heartbeat,
+            EnvelopeType.MESSAGE: self.on_message,
+            EnvelopeType.ERROR: self.on_error,
+        }
 
         # 日志器
         self.logger = get_logger("star_protocol.client")
@@ -96,6 +135,20 @@ class BaseClient:
         self._metrics_enabled = False
         self._metrics_collector = None
 
+        # 批量发送（可选）：batch_size > 1 时在 batch_window_us 微秒窗口内合并发送
+        self.batch_size = batch_size
+        self.batch_window_us = batch_window_us
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._send_flusher_task: Optional[asyncio.Task] = None
+        # 批量发送失败的异常，之后的发送会直接抛出
+        self._send_error: Optional[BaseException] = None
+
+        # 接收处理：读取循环只负责收包，由 receive_concurrency 个 worker 处理信封
+        self.receive_concurrency = receive_concurrency
+        # 接收队列元素为 (信封, 原始帧字节数)
+        self._receive_queue: Optional[asyncio.Queue] = None
+        self._receive_workers: List[asyncio.Task] = []
+
     # ===========================================
     # 4个装饰器 - 用户自定义处理器注册
     # ===========================================
@@ -114,21 +167,36 @@ class BaseClient:
             @client.action("move")
             async def handle_move(message: ActionMessage):
                 print(f"收到移动动作: {message.parameters}")
+
+            # 参数名为 ctx 时传入 MessageContext（包含发送者等信息）
+            @client.action("pickup")
+            async def handle_pickup(ctx: MessageContext):
+                print(f"{ctx.sender} 拾取: {ctx.message.parameters}")
         """
 
         def decorator(func: Callable):
-            # 检查函数签名以决定传递什么参数
-            sig = inspect.signature(func)
-            params = list(sig.parameters.keys())
+            # 检查函数签名以决定传递什么参数；只在注册时执行一次，
+            # inspect.signature 会跟随 functools.wraps 设置的 __wrapped__
+            ctx_param = inspect.signature(func).parameters.get("ctx")
+            has_ctx = ctx_param is not None
+            ctx_kwonly = has_ctx and ctx_param.kind is inspect.Parameter.KEYWORD_ONLY
+            if has_ctx:
+                self._action_needs_ctx = True
 
             # 包装函数以支持过滤和上下文传递
-            async def wrapper(message: ActionMessage):
-                if asyncio.iscoroutinefunction(func):
-                    return await func(message)
+            async def wrapper(ctx: MessageContext):
+                if ctx_kwonly:
+                    result = func(ctx=ctx)
                 else:
-                    return func(message)
+                    result = func(ctx if has_ctx else ctx.message)
+                if inspect.isawaitable(result):
+                    return await result
+                return result
 
-            self._action_handlers[action_name] = wrapper
+            if action_name is None:
+                self._action_handlers_wild.append(wrapper)
+            else:
+                self._action_handlers_by_name[action_name].append(wrapper)
             return func
 
         return decorator
@@ -153,7 +221,10 @@ class BaseClient:
                 else:
                     return func(message)
 
-            self._outcome_handlers[action_name] = wrapper
+            if action_name is None:
+                self._outcome_handlers_wild.append(wrapper)
+            else:
+                self._outcome_handlers_by_name[action_name].append(wrapper)
             return func
 
         return decorator
@@ -182,7 +253,10 @@ class BaseClient:
                 else:
                     return func(message)
 
-            self._event_handlers[event_name] = wrapper
+            if event_name is None:
+                self._event_handlers_wild.append(wrapper)
+            else:
+                self._event_handlers_by_name[event_name].append(wrapper)
             return func
 
         return decorator
@@ -211,7 +285,10 @@ class BaseClient:
                 else:
                     return func(message)
 
-            self._stream_handlers[stream_name] = wrapper
+            if stream_name is None:
+                self._stream_handlers_wild.append(wrapper)
+            else:
+                self._stream_handlers_by_name[stream_name].append(wrapper)
             return func
 
         return decorator
@@ -257,8 +334,6 @@ class BaseClient:
             # 处理 outcome 响应，尝试匹配上下文
             await self.on_outcome(envelope)
         elif isinstance(message, EventMessage):
-            # 处理 event 响应，尝试匹配上下文
-            # await self._handle_event_response(message)
             await self.on_event(envelope)
         elif isinstance(message, StreamMessage):
             await self.on_stream(envelope)
@@ -274,28 +349,36 @@ class BaseClient:
         """
         message = envelope.message
         self.logger.debug(f"收到动作: {message.action} from {envelope.sender}")
-        action_name = message.action
-        # 调用用户注册的处理器
-        if action_name in self._action_handlers:
-            try:
-                handler = self._action_handlers[action_name]
-                result = await handler(message)
-                self.logger.info(f"Action 执行完毕的结果: {result}")
-                # await self.send_outcome(
-                #     data=result,
-                #     recipient=envelope.sender,
-                #     action=message.action,
-                #     action_id=message.action_id,
-                # )
-                out_msg = OutcomeMessage(
-                    outcome=message.action, action_id=message.action_id, data=result
-                )
-                await self.send_message(
-                    message=out_msg,
-                    recipient=envelope.sender,
-                )
-            except Exception as e:
-                self.logger.error(f"ACTION 处理器出错: {e}")
+        named = self._action_handlers_by_name.get(message.action, ())
+        handlers = [*self._action_handlers_wild, *named]
+        if not handlers:
+            return
+
+        ctx = MessageContext(
+            message=message,
+            sender=envelope.sender,
+            recipient=envelope.recipient,
+            envelope_type=envelope.envelope_type,
+            # 只有存在读取 ctx 的处理器时才取时间戳
+            timestamp=time.time() if self._action_needs_ctx else 0.0,
+        )
+
+        # 调用用户注册的处理器；未指定名称的处理器只执行副作用，
+        # 只有存在指定名称的处理器时才以其结果作为 outcome 返回
+        result = (await self._run_handlers(handlers, ctx, "ACTION"))[-1]
+        if not named or isinstance(result, BaseException):
+            return
+        try:
+            self.logger.info(f"Action 执行完毕的结果: {result}")
+            out_msg = OutcomeMessage(
+                outcome=message.action, action_id=message.action_id, data=result
+            )
+            await self.send_message(
+                message=out_msg,
+                recipient=envelope.sender,
+            )
+        except Exception as e:
+            self.logger.error(f"发送 OUTCOME 失败: {e}")
 
     async def on_outcome(self, envelope: Envelope) -> None:
         """处理 OUTCOME 消息事件（默认实现）
@@ -306,21 +389,15 @@ class BaseClient:
         message = envelope.message
         self.logger.debug(f"收到结果: {message.action_id} - {message.data}")
 
-        outcome = message.outcome
+        # 未指定名称的处理器只做观察，不影响上下文匹配
+        named_handlers = self._outcome_handlers_by_name.get(message.outcome)
+        handlers = [*self._outcome_handlers_wild, *(named_handlers or ())]
+        if handlers:
+            await self._run_handlers(handlers, message, "OUTCOME")
 
-        if outcome in self._outcome_handlers:
-            # 如果有针对特定 outcome 的处理器，优先调用
-            try:
-                handler = self._outcome_handlers[outcome]
-                await handler(message)
-            except Exception as e:
-                self.logger.error(f"OUTCOME 处理器出错: {e}")
-        else:  # 如无指定 默认加入 context
-            item = self.context.get_request_context(message.action_id)
-            if item and item.future:
-                item.future.set_result(message.data)
-            else:
-                self.logger.warning(f"未找到对应的上下文项: {message.action_id}")
+        if not named_handlers:  # 如无指定 默认加入 context
+            # 通过 complete_request 完成，同时取消超时定时器并更新统计
+            self.context.complete_request(message.action_id, message.data)
 
     async def on_event(self, envelope: Envelope) -> None:
         """处理 EVENT 消息事件（默认实现）
@@ -332,29 +409,68 @@ class BaseClient:
         self.logger.debug(f"收到事件: {message.event}")
 
         event = message.event
-        if event in self._event_handlers:
-            try:
-                handler = self._event_handlers[event]
-                await handler(message)
-            except Exception as e:
-                self.logger.error(f"EVENT 处理器出错: {e}")
+        handlers = [
+            *self._event_handlers_wild,
+            *self._event_handlers_by_name.get(event, ()),
+        ]
+        if handlers:
+            await self._run_handlers(handlers, message, "EVENT")
         else:  # 不存在
             self.logger.warning(f"未知事件类型: {event}")
 
-    async def on_stream(self, message: StreamMessage) -> None:
+    async def on_stream(self, envelope: Envelope) -> None:
         """处理 STREAM 消息事件（默认实现）
 
         Args:
-            message: STREAM 消息
+            envelope: 消息信封
         """
+        message = envelope.message
         self.logger.debug(f"收到流数据: {message.stream} #{message.sequence}")
 
         # 调用用户注册的处理器
-        for handler in self._stream_handlers:
+        handlers = [
+            *self._stream_handlers_wild,
+            *self._stream_handlers_by_name.get(message.stream, ()),
+        ]
+        if handlers:
+            await self._run_handlers(handlers, message, "STREAM")
+
+    async def _run_handlers(
+        self, handlers: List[Callable], message: Any, kind: str
+    ) -> List[Any]:
+        """执行用户处理器
+
+        单个处理器直接 await；多个处理器通过 asyncio.gather 并发执行，
+        每个处理器的异常单独记录，互不影响。
+
+        Args:
+            handlers: 处理器列表（非空）
+            message: 传给处理器的消息（ACTION 处理器为 MessageContext）
+            kind: 消息类型名称，用于日志
+
+        Returns:
+            各处理器的返回值，出错的处理器对应其异常对象
+
+        Raises:
+            asyncio.CancelledError: 某个处理器被取消
+        """
+        if len(handlers) == 1:
             try:
-                await handler(message)
+                return [await handlers[0](message)]
             except Exception as e:
-                self.logger.error(f"STREAM 处理器出错: {e}")
+                self.logger.error(f"{kind} 处理器出错: {e}")
+                return [e]
+
+        results = await asyncio.gather(
+            *(handler(message) for handler in handlers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                # 处理器被取消时向上传播，不当作普通返回值
+                raise result
+            if isinstance(result, BaseException):
+                self.logger.error(f"{kind} 处理器出错: {result}")
+        return results
 
     # ===========================================
     # 连接和消息发送
@@ -368,12 +484,23 @@ class BaseClient:
             self.connected = True
 
             # 启动上下文管理器
-            # await self.context.start()
+            await self.context.start()
 
             # 发送 connect event 作为第一条消息
             await self._send_connect_event()
 
-            # 启动消息监听
+            # 启动批量发送（如果启用）
+            if self.batch_size > 1:
+                self._send_error = None
+                self._send_queue = asyncio.Queue(maxsize=1024)
+                self._send_flusher_task = asyncio.create_task(self._send_flusher())
+
+            # 启动消息处理 worker 和消息监听
+            self._receive_queue = asyncio.Queue(maxsize=1024)
+            self._receive_workers = [
+                asyncio.create_task(self._receive_worker())
+                for _ in range(max(1, self.receive_concurrency))
+            ]
             asyncio.create_task(self.receive_loop())
 
             self.logger.info("连接成功")
@@ -401,8 +528,7 @@ class BaseClient:
         )
 
         # 发送连接事件
-        json_str = envelope.to_json()
-        await self.websocket.send(json_str)
+        await self.websocket.send(envelope.to_bytes(), text=True)
         self.logger.debug(f"已发送 connect event: {client_info}")
 
     def _get_client_identity(self) -> dict:
@@ -417,9 +543,16 @@ class BaseClient:
         """断开连接"""
         if self.connected and self.websocket:
             try:
+                # 发送完队列中的消息后停止批量发送
+                await self._stop_send_flusher()
+
                 # 停止上下文管理器
                 await self.context.stop()
 
+                # 写入剩余的指标并停止指标后台任务
+                if self._metrics_collector:
+                    await self._metrics_collector.close()
+
                 # 关闭 WebSocket
                 await self.websocket.close()
 
@@ -430,29 +563,131 @@ class BaseClient:
                 self.websocket = None
                 self.logger.info("连接已断开")
 
-    async def send_envelope(self, envelope: Envelope) -> None:
-        """发送信封消息
+    async def _send_envelope_nometrics(self, envelope: Envelope) -> None:
+        """发送信封消息（未启用监控）
 
         Args:
             envelope: 要发送的信封
         """
-        if not self.connected or not self.websocket:
+        ws = self.websocket
+        if not self.connected or ws is None:
             raise RuntimeError("客户端未连接")
 
         try:
-            json_str = envelope.to_json()
-            await self.websocket.send(json_str)
+            queue = self._send_queue
+            if queue is None:
+                await ws.send(envelope.to_bytes(), text=True)
+            else:
+                self._raise_send_error()
+                await queue.put(envelope.to_bytes())
+        except Exception as e:
+            self.logger.error(f"发送信封失败: {e}")
+            raise
+
+        self.logger.debug("发送信封: %s", envelope.envelope_type.value)
 
-            self.logger.debug(f"发送信封: {envelope.envelope_type.value}")
+    async def _send_envelope_metrics(self, envelope: Envelope) -> None:
+        """发送信封消息并记录指标（启用监控）
 
-            # 记录指标（如果启用）
-            if self._metrics_enabled and self._metrics_collector:
-                await self._metrics_collector.record_envelope_sent(envelope)
+        Args:
+            envelope: 要发送的信封
+        """
+        ws = self.websocket
+        if not self.connected or ws is None:
+            raise RuntimeError("客户端未连接")
 
+        try:
+            queue = self._send_queue
+            if queue is None:
+                await ws.send(envelope.to_bytes(), text=True)
+            else:
+                self._raise_send_error()
+                await queue.put(envelope.to_bytes())
+            self.logger.debug("发送信封: %s", envelope.envelope_type.value)
+            await self._metrics_collector.record_envelope_sent(envelope)
         except Exception as e:
             self.logger.error(f"发送信封失败: {e}")
             raise
 
+    async def _send_flusher(self) -> None:
+        """批量发送循环
+
+        等待第一帧到达后再等待 batch_window_us 微秒，将窗口内排队的帧
+        （最多 batch_size 个）一次取出并写出。
+
+        写出失败时记录异常并丢弃队列中剩余的帧，之后的 send_envelope 会抛出该异常。
+        """
+        queue = self._send_queue
+        window = self.batch_window_us / 1_000_000
+
+        while True:
+            frames = [await queue.get()]
+            if window > 0:
+                await asyncio.sleep(window)
+            while len(frames) < self.batch_size and not queue.empty():
+                frames.append(queue.get_nowait())
+
+            try:
+                await self._write_frames(frames)
+            except Exception as e:
+                self._send_error = e
+                dropped = len(frames) + self._discard_send_queue()
+                self.logger.error("批量发送失败，丢弃 %d 条消息: %s", dropped, e)
+                return
+            finally:
+                for _ in frames:
+                    queue.task_done()
+
+    async def _write_frames(self, frames: List[bytes]) -> None:
+        """将一批帧依次写入 WebSocket
+
+        只使用公开的 send 接口；websockets 只在写缓冲区超过高水位时才等待 drain，
+        因此同一批帧通常在一次唤醒内连续写出。
+        """
+        ws = self.websocket
+        if ws is None:
+            raise RuntimeError("客户端未连接")
+
+        for frame in frames:
+            await ws.send(frame, text=True)
+
+    def _discard_send_queue(self) -> int:
+        """丢弃发送队列中尚未写出的帧，返回丢弃的数量"""
+        queue = self._send_queue
+        dropped = 0
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+            dropped += 1
+        return dropped
+
+    def _raise_send_error(self) -> None:
+        """批量发送已失败时抛出异常，避免消息进入无人处理的队列"""
+        if self._send_error is not None:
+            error = self._send_error
+            raise ConnectionError(f"批量发送已失败: {error}") from error
+
+    async def _stop_send_flusher(self) -> None:
+        """等待发送队列写完后停止批量发送任务"""
+        task = self._send_flusher_task
+        if task is None:
+            return
+
+        if not task.done():
+            await self._send_queue.join()
+            task.cancel()
+        else:
+            dropped = self._discard_send_queue()
+            if dropped:
+                self.logger.warning("批量发送任务已退出，丢弃 %d 条消息", dropped)
+
+        self._send_flusher_task = None
+        self._send_queue = None
+
+    # 发送信封消息：默认不记录指标，enable_metrics/disable_metrics 会在实例上
+    # 切换为对应的实现，避免每次发送都判断监控状态
+    send_envelope = _send_envelope_nometrics
+
     async def send_message(self, message: Message, recipient: str) -> None:
         """发送消息（包装在信封中）
 
@@ -461,23 +696,44 @@ class BaseClient:
             recipient: 目标客户端ID
         """
         envelope = Envelope(
-            envelope_type=EnvelopeType.MESSAGE,
-            sender=self.client_info.client_id,
-            recipient=recipient,
-            message=message,
+            **self._envelope_proto_args, recipient=recipient, message=message
         )
         await self.send_envelope(envelope)
 
+    async def send_messages(self, messages: Iterable[Message], recipient: str) -> None:
+        """批量发送多条消息到同一个接收者
+
+        整批信封共享同一个时间戳；启用批量发送时会在同一窗口内合并写出。
+
+        Args:
+            messages: 要发送的消息列表
+            recipient: 目标客户端ID
+        """
+        for envelope in Envelope.batch(
+            messages, recipient=recipient, **self._envelope_proto_args
+        ):
+            await self.send_envelope(envelope)
+
     async def receive_loop(self) -> None:
-        """消息监听循环"""
+        """消息监听循环
+
+        只负责读取和解析，信封交给接收队列由 worker 处理；
+        队列满时读取会暂停，形成自然的背压。
+        """
+        queue = self._receive_queue
         try:
-            async for raw_message in self.websocket:
+            ws = self.websocket
+            while True:
+                # 直接获取 UTF-8 字节交给 JSON 解析器，省去中间的 str 解码
+                raw_message = await ws.recv(decode=False)
                 try:
-                    envelope = Envelope.from_json(raw_message)
-                    await self._handle_envelope(envelope)
-
+                    # Hub 只转发已校验的信封，跳过重复的字段校验
+                    envelope = Envelope.from_json(raw_message, trusted=True)
                 except Exception as e:
                     self.logger.error(f"处理消息失败: {e}")
+                    continue
+                # 同时传入原始帧长度，记录指标时无需重新序列化
+                await queue.put((envelope, len(raw_message)))
 
         except websockets.exceptions.ConnectionClosed:
             self.logger.info("WebSocket 连接已关闭")
@@ -485,23 +741,53 @@ class BaseClient:
         except Exception as e:
             self.logger.error(f"消息循环出错: {e}")
             self.connected = False
+        finally:
+            # 先处理完连接关闭前已收到的信封，再停止 worker
+            workers = self._receive_workers
+            if any(not worker.done() for worker in workers):
+                await queue.join()
+            for worker in workers:
+                worker.cancel()
+            self._receive_workers = []
+
+            # 服务端关闭连接时 disconnect 不会被调用，这里停止批量发送任务；
+            # 连接已关闭，剩余的帧写出失败后会被丢弃并记录
+            await self._stop_send_flusher()
+
+    async def _receive_worker(self) -> None:
+        """消息处理 worker，从接收队列中取出信封并处理"""
+        queue = self._receive_queue
+        while True:
+            envelope, envelope_size = await queue.get()
+            try:
+                await self._handle_envelope(envelope, envelope_size)
+            except Exception as e:
+                self.logger.error(f"处理消息失败: {e}")
+            finally:
+                queue.task_done()
 
-    async def _handle_envelope(self, envelope: Envelope) -> None:
-        """处理接收到的信封"""
+    async def _handle_envelope(
+        self, envelope: Envelope, envelope_size: Optional[int] = None
+    ) -> None:
+        """处理接收到的信封
+
+        Args:
+            envelope: 信封
+            envelope_size: 原始帧的字节数，用于记录指标
+        """
         self.logger.debug(f"收到信封: {envelope.envelope_type.value}")
 
         # 记录指标（如果启用）
         if self._metrics_enabled and self._metrics_collector:
-            await self._metrics_collector.record_envelope_received(envelope)
+            await self._metrics_collector.record_envelope_received(
+                envelope, envelope_size
+            )
 
         # 根据信封类型分发到相应的处理方法
         try:
-            if envelope.envelope_type == EnvelopeType.HEARTBEAT:
-                await self.on_heartbeat(envelope)
-            elif envelope.envelope_type == EnvelopeType.MESSAGE:
-                await self.on_message(envelope)
-            elif envelope.envelope_type == EnvelopeType.ERROR:
-                await self.on_error(envelope)
+            handler = self._env_dispatch.get(envelope.envelope_type)
+            if handler is not None:
+                await handler(envelope)
             else:
                 self.logger.warning(f"未知信封类型: {envelope.envelope_type}")
 
@@ -526,74 +812,13 @@ class BaseClient:
             self._metrics_collector = MetricsCollector()
         else:
             self._metrics_collector = collector
+        self.send_envelope = self._send_envelope_metrics
 
     def disable_metrics(self) -> None:
         """禁用监控"""
         self._metrics_enabled = False
         self._metrics_collector = None
-
-    # ===========================================
-    # 上下文响应处理
-    # ===========================================
-
-    # async def _handle_outcome_response(self, envelope: Envelope) -> None:
-    #     """处理 outcome 响应，匹配到对应的 action 上下文
-
-    #     Args:
-    #         envelope: 包含 outcome 消息的信封
-    #     """
-    #     outcome = envelope.message
-    #     # 尝试从 outcome 中提取对应的 action_id
-    #     action_id = getattr(outcome, "action_id", None)
-    #     if not action_id:
-    #         # 如果没有直接的 action_id，尝试从 data 中提取
-    #         if hasattr(outcome, "data") and isinstance(outcome.data, dict):
-    #             action_id = outcome.data.get("action_id") or outcome.data.get(
-    #                 "request_id"
-    #             )
-
-    #     if action_id:
-    #         # 尝试完成对应的上下文
-    #         success = self.context.complete_request(action_id, outcome)
-    #         if success:
-    #             self.logger.debug(f"匹配到 action 上下文: {action_id}")
-    #         else:
-    #             self.logger.debug(f"未找到匹配的 action 上下文: {action_id}")
-
-    #     if action_id:
-    #         # 尝试完成对应的上下文
-    #         success = self.context.complete_request(action_id, outcome)
-    #         if success:
-    #             self.logger.debug(f"匹配到 action 上下文: {action_id}")
-    #         else:
-    #             self.logger.debug(f"未找到匹配的 action 上下文: {action_id}")
-
-    async def _handle_event_response(self, event: EventMessage) -> None:
-        """处理 event 响应，匹配到对应的上下文
-
-        Args:
-            event: event 消息
-        """
-        # 尝试从 event 中提取对应的请求ID
-        request_id = None
-        if hasattr(event, "data") and isinstance(event.data, dict):
-            request_id = event.data.get("request_id") or event.data.get("action_id")
-
-        # 特殊处理一些系统事件
-        if event.event == "client_registered":
-            # 处理客户端注册确认
-            self.logger.debug("收到客户端注册确认")
-            return
-        elif event.event == "agent_joined":
-            # 处理 agent 加入通知
-            self.logger.debug(f"收到 agent 加入通知: {event.data}")
-            return
-
-        if request_id:
-            # 尝试完成对应的上下文
-            success = self.context.complete_request(request_id, event)
-            if success:
-                self.logger.debug(f"匹配到 event 上下文: {request_id}")
+        self.send_envelope = self._send_envelope_nometrics
 
     # ===========================================
     # 便捷的发送方法（带上下文管理）
@@ -605,6 +830,7 @@ class BaseClient:
         params: Dict[str, Any],
         recipient: str,
         timeout: Optional[float] = 600,
+        wait_for_outcome: bool = True,
     ) -> Any:
         """发送 action 并等待 outcome（带上下文管理）
 
@@ -613,19 +839,22 @@ class BaseClient:
             params: 动作参数
             recipient: 接收者
             timeout: 超时时间
+            wait_for_outcome: 是否创建上下文等待 outcome，为 False 时仅发送
 
         Returns:
             返回 request_id
         """
 
-        # 创建上下文
-        context_item = self.context.create_request_context(
-            request_type="action",
-            # request_data={"action": action, "params": params, "recipient": recipient},
-            timeout=timeout,
-        )
-
-        request_id = context_item.request_id
+        if wait_for_outcome:
+            # 创建上下文
+            context_item = self.context.create_request_context(
+                request_type="action",
+                timeout=timeout,
+            )
+            request_id = context_item.request_id
+        else:
+            # 不等待结果：不创建上下文，由 ActionMessage 自动生成 ID
+            request_id = ""
 
         # 创建 action 消息
         action_message = ActionMessage(
@@ -633,6 +862,7 @@ class BaseClient:
             parameters=params,
             action_id=request_id,  # 使用 request_id 作为 action_id
         )
+        request_id = action_message.action_id
 
         # 创建信封并发送
         envelope = Envelope(
@@ -1,9 +1,21 @@
 """客户端上下文管理模块"""
 
 import asyncio
+import itertools
+import os
 import time
-import uuid
-from typing import Dict, Any, Optional, Callable, Awaitable, TypeVar, Generic
+from collections import deque
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    Callable,
+    Awaitable,
+    TypeVar,
+    Generic,
+    Deque,
+    Tuple,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 from ..utils import get_logger
@@ -20,7 +32,7 @@ class RequestStatus(Enum):
     ERROR = "error"  # 错误
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextItem(Generic[T]):
     """上下文项"""
 
@@ -29,23 +41,51 @@ class ContextItem(Generic[T]):
     # request_data: Dict[str, Any]
     # status: ContextStatus = ContextStatus.PENDING
     status: RequestStatus = RequestStatus.PENDING
-    created_at: float = field(default_factory=time.time)
+    # 创建/结束时间为墙上时钟 time.time()，可与信封时间戳比较
+    created_at: float = 0.0
     completed_at: Optional[float] = None
     # timeout: float = 30.0
     future: Optional[asyncio.Future[T]] = None
     callback: Optional[Callable[[T], Awaitable[None]]] = None
+    # 超时定时器，上下文结束时取消
+    timer_handle: Optional[asyncio.TimerHandle] = None
+    # 所属事件循环，用于读取时钟和创建 future
+    loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False)
     # metadata: Dict[str, Any] = field(default_factory=dict)
+    # 内部使用的事件循环时钟 loop.time()（单调时钟），用于计算耗时和清理期限
+    _started: float = field(default=0.0, init=False, repr=False, compare=False)
+    _finished: Optional[float] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        if not self.created_at:
+            self.created_at = time.time()
+        self._started = self.loop.time()
         if self.future is None:
-            self.future = asyncio.Future()
+            self.future = self.loop.create_future()
+
+    def _cancel_timer(self) -> None:
+        """取消超时定时器"""
+        if self.timer_handle is not None:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+
+    def _set_finished(self, status: RequestStatus) -> None:
+        """设置结束状态：取消超时定时器并记录结束时间"""
+        self.status = status
+        self._cancel_timer()
+        self.completed_at = time.time()
+        self._finished = self.loop.time()
 
     @property
     def elapsed_time(self) -> float:
-        """获取已经过的时间"""
-        if self.completed_at:
-            return self.completed_at - self.created_at
-        return time.time() - self.created_at
+        """获取已经过的时间（按单调时钟计算）"""
+        if self._finished is not None:
+            return self._finished - self._started
+        return self.loop.time() - self._started
 
     # @property
     # def is_expired(self) -> bool:
@@ -57,8 +97,7 @@ class ContextItem(Generic[T]):
         if self.status != RequestStatus.PENDING:
             return
 
-        self.status = RequestStatus.COMPLETED
-        # self.completed_at = time.time()
+        self._set_finished(RequestStatus.COMPLETED)
 
         if self.future and not self.future.done():
             self.future.set_result(result)
@@ -68,8 +107,7 @@ class ContextItem(Generic[T]):
         if self.status != RequestStatus.PENDING:
             return
 
-        self.status = RequestStatus.ERROR
-        # self.completed_at = time.time()
+        self._set_finished(RequestStatus.ERROR)
 
         if self.future and not self.future.done():
             self.future.set_exception(exception)
@@ -79,8 +117,7 @@ class ContextItem(Generic[T]):
         if self.status != RequestStatus.PENDING:
             return
 
-        self.status = RequestStatus.TIMEOUT
-        # self.completed_at = time.time()
+        self._set_finished(RequestStatus.TIMEOUT)
 
         if self.future and not self.future.done():
             self.future.set_exception(
@@ -99,9 +136,17 @@ class ClientContext:
     - 统计信息
     """
 
-    def __init__(self, client_id: str, default_timeout: float = 30.0):
+    # 回调执行任务每轮最多连续执行的回调数，之后让出事件循环
+    CALLBACK_BATCH_SIZE = 64
+
+    # 未指定超时时请求上下文的默认超时（秒），与原先等待响应的 600 秒保持一致
+    DEFAULT_TIMEOUT = 600.0
+
+    def __init__(self, client_id: str, default_timeout: Optional[float] = None):
         self.client_id = client_id
-        self.default_timeout = default_timeout
+        self.default_timeout = (
+            self.DEFAULT_TIMEOUT if default_timeout is None else default_timeout
+        )
 
         # 上下文存储：request_id -> ContextItem
         self._contexts: Dict[str, ContextItem] = {}
@@ -109,6 +154,17 @@ class ClientContext:
         # 类型映射：便于按类型查找
         self._type_mapping: Dict[str, set] = {}
 
+        # 请求ID：进程级种子 + 自增计数器，避免每次请求调用 uuid 和时钟
+        self._id_seed = f"{os.getpid() ^ int(time.time()):x}"
+        self._id_counter = itertools.count(1)
+
+        # 所属事件循环（首次使用时获取）
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 待执行的回调队列，由单个任务批量顺序执行
+        self._cb_queue: Deque[Tuple[ContextItem, Any]] = deque()
+        self._cb_runner: Optional[asyncio.Task] = None
+
         # 统计信息
         self._stats = {
             "total_requests": 0,
@@ -117,28 +173,31 @@ class ClientContext:
             "error_requests": 0,
         }
 
-        # 清理任务
-        # self._cleanup_task: Optional[asyncio.Task] = None
-        # self._cleanup_interval = 60.0  # 60秒清理一次
+        # 清理定时器：通过 loop.call_later 链式调度，不占用常驻任务
+        self._cleanup_handle: Optional[asyncio.TimerHandle] = None
+        self._cleanup_interval = 60.0  # 60秒清理一次
+        self._completed_retention = 300.0  # 已结束的上下文保留5分钟
+
+        # 已结束上下文的 FIFO：(结束时的 loop.time(), request_id)，按结束顺序排列
+        self._completed_fifo: Deque[Tuple[float, str]] = deque()
 
         self.logger = get_logger(f"context.{client_id}")
 
-    # async def start(self) -> None:
-    #     """启动上下文管理器"""
-    #     if self._cleanup_task is None:
-    #         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
-    #         self.logger.debug("上下文管理器已启动")
-
-    # async def stop(self) -> None:
-    #     """停止上下文管理器"""
-    #     if self._cleanup_task:
-    #         self._cleanup_task.cancel()
-    #         try:
-    #             await self._cleanup_task
-    #         except asyncio.CancelledError:
-    #             pass
-    #         self._cleanup_task = None
-    #         self.logger.debug("上下文管理器已停止")
+    async def start(self) -> None:
+        """启动上下文管理器"""
+        if self._cleanup_handle is None:
+            self._loop = asyncio.get_running_loop()
+            self._cleanup_handle = self._loop.call_later(
+                self._cleanup_interval, self._cleanup_tick
+            )
+            self.logger.debug("上下文管理器已启动")
+
+    async def stop(self) -> None:
+        """停止上下文管理器"""
+        if self._cleanup_handle:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
+            self.logger.debug("上下文管理器已停止")
 
     def create_request_context(
         self,
@@ -168,15 +227,23 @@ class ClientContext:
         if timeout is None:
             timeout = self.default_timeout
 
+        loop = self._get_loop()
         context_item = ContextItem(
             request_id=request_id,
             request_type=request_type,
             # request_data=request_data,
             # timeout=timeout,
             callback=callback,
+            loop=loop,
             # metadata=metadata or {},
         )
 
+        # 到期时由定时器标记超时，无需周期性扫描所有上下文
+        if timeout is not None and timeout > 0:
+            context_item.timer_handle = loop.call_later(
+                timeout, self._on_expire, request_id
+            )
+
         # 存储上下文
         self._contexts[request_id] = context_item
 
@@ -188,7 +255,7 @@ class ClientContext:
         # 更新统计
         self._stats["total_requests"] += 1
 
-        self.logger.debug(f"创建上下文: {request_id} ({request_type})")
+        self.logger.debug("创建上下文: %s (%s)", request_id, request_type)
         return context_item
 
     def complete_request(
@@ -209,26 +276,29 @@ class ClientContext:
         """
         context_item = self._contexts.get(request_id)
         if not context_item:
-            self.logger.warning(f"未找到上下文: {request_id}")
+            self.logger.warning("未找到上下文: %s", request_id)
             return False
 
         if context_item.status != RequestStatus.PENDING:
             self.logger.warning(
-                f"上下文 {request_id} 已经完成，状态: {context_item.status}"
+                "上下文 %s 已经完成，状态: %s", request_id, context_item.status
             )
             return False
 
         # 完成上下文
         context_item.complete(result)
         self._stats["completed_requests"] += 1
+        self._mark_finished(context_item)
 
         self.logger.debug(
-            f"完成上下文: {request_id} 耗时: {context_item.elapsed_time:.2f}s"
+            "完成上下文: %s 耗时: %.2fs", request_id, context_item.elapsed_time
         )
 
-        # 触发回调
+        # 触发回调：加入回调队列，只在没有执行任务时才创建任务
         if trigger_callback and context_item.callback:
-            asyncio.create_task(self._execute_callback(context_item, result))
+            self._cb_queue.append((context_item, result))
+            if self._cb_runner is None or self._cb_runner.done():
+                self._cb_runner = self._get_loop().create_task(self._run_callbacks())
 
         return True
 
@@ -244,7 +314,7 @@ class ClientContext:
         """
         context_item = self._contexts.get(request_id)
         if not context_item:
-            self.logger.warning(f"未找到上下文: {request_id}")
+            self.logger.warning("未找到上下文: %s", request_id)
             return False
 
         if context_item.status != RequestStatus.PENDING:
@@ -252,20 +322,25 @@ class ClientContext:
 
         context_item.error(exception)
         self._stats["error_requests"] += 1
+        self._mark_finished(context_item)
 
-        self.logger.warning(f"上下文错误: {request_id} - {exception}")
+        self.logger.warning("上下文错误: %s - %s", request_id, exception)
         return True
 
     async def wait_for_response(
         self,
         request_id: str,
-        timeout: Optional[float] = 600,
+        timeout: Optional[float] = None,
     ) -> Any:
         """等待响应
 
+        上下文创建时已经安排了超时定时器，默认直接等待 future，
+        超时由定时器设置 asyncio.TimeoutError。
+
         Args:
             request_id: 请求ID
-            timeout: 超时时间（秒）
+            timeout: 额外的等待超时时间（秒），为 None 时只使用上下文自身的超时
+                （创建时未指定则为 default_timeout，默认 600 秒）
 
         Returns:
             响应结果
@@ -279,20 +354,22 @@ class ClientContext:
         if not context_item:
             raise KeyError(f"未找到上下文: {request_id}")
 
-        if not context_item.future:
+        future = context_item.future
+        if not future:
             raise RuntimeError(f"上下文 {request_id} 没有 future")
 
-        # if timeout is None:
-        #     timeout = context_item.timeout
+        if timeout is None:
+            return await future
 
         try:
-            result = await asyncio.wait_for(context_item.future, timeout=timeout)
-            return result
+            return await asyncio.wait_for(future, timeout=timeout)
         except asyncio.TimeoutError:
-            # 标记为超时
-            context_item.timeout_expired()
-            self._stats["timeout_requests"] += 1
-            self.logger.warning(f"上下文超时: {request_id}")
+            # 标记为超时（超时定时器可能已经处理过）
+            if context_item.status == RequestStatus.PENDING:
+                context_item.timeout_expired()
+                self._stats["timeout_requests"] += 1
+                self._mark_finished(context_item)
+                self.logger.warning("上下文超时: %s", request_id)
             raise
 
     def get_request_context(self, request_id: str) -> Optional[ContextItem]:
@@ -329,7 +406,10 @@ class ClientContext:
             if not self._type_mapping[request_type]:
                 del self._type_mapping[request_type]
 
-        self.logger.debug(f"移除上下文: {request_id}")
+        # 上下文不再被管理，取消尚未触发的超时定时器
+        context_item._cancel_timer()
+
+        self.logger.debug("移除上下文: %s", request_id)
         return True
 
     def get_stats(self) -> Dict[str, Any]:
@@ -344,9 +424,36 @@ class ClientContext:
 
     def _generate_request_id(self, request_type: str) -> str:
         """生成请求ID"""
-        timestamp = int(time.time() * 1000)
-        unique_id = str(uuid.uuid4())[:8]
-        return f"{self.client_id}_{request_type}_{timestamp}_{unique_id}"
+        seq = next(self._id_counter)
+        return f"{self.client_id}_{request_type}_{self._id_seed}_{seq}"
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """获取并缓存当前运行的事件循环"""
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = asyncio.get_running_loop()
+        return loop
+
+    def _on_expire(self, request_id: str) -> None:
+        """超时定时器回调：将仍在等待的上下文标记为超时"""
+        context_item = self._contexts.get(request_id)
+        if not context_item or context_item.status != RequestStatus.PENDING:
+            return
+
+        context_item.timer_handle = None
+        context_item.timeout_expired()
+        self._stats["timeout_requests"] += 1
+        self._mark_finished(context_item)
+        self.logger.warning("上下文超时: %s", request_id)
+
+    async def _run_callbacks(self) -> None:
+        """顺序执行回调队列，每执行 CALLBACK_BATCH_SIZE 个回调让出一次事件循环"""
+        queue = self._cb_queue
+        while queue:
+            for _ in range(min(len(queue), self.CALLBACK_BATCH_SIZE)):
+                context_item, result = queue.popleft()
+                await self._execute_callback(context_item, result)
+            await asyncio.sleep(0)
 
     async def _execute_callback(self, context_item: ContextItem, result: Any) -> None:
         """执行回调函数"""
@@ -354,44 +461,48 @@ class ClientContext:
             if context_item.callback:
                 await context_item.callback(result)
         except Exception as e:
-            self.logger.error(f"回调执行失败 {context_item.request_id}: {e}")
-
-    # async def _cleanup_loop(self) -> None:
-    #     """清理循环，移除过期的上下文"""
-    #     while True:
-    #         try:
-    #             await asyncio.sleep(self._cleanup_interval)
-    #             await self._cleanup_expired_contexts()
-    #         except asyncio.CancelledError:
-    #             break
-    #         except Exception as e:
-    #             self.logger.error(f"清理循环出错: {e}")
-
-    # async def _cleanup_expired_contexts(self) -> None:
-    #     """清理过期的上下文"""
-    #     expired_ids = []
-
-    #     for request_id, context_item in self._contexts.items():
-    #         if context_item.status == RequestStatus.PENDING and context_item.is_expired:
-    #             # 标记为超时
-    #             context_item.timeout_expired()
-    #             self._stats["timeout_requests"] += 1
-    #             expired_ids.append(request_id)
-    #         elif context_item.status in [
-    #             RequestStatus.COMPLETED,
-    #             RequestStatus.TIMEOUT,
-    #             RequestStatus.ERROR,
-    #         ]:
-    #             # 清理已完成的上下文（保留一段时间后清理）
-    #             if context_item.elapsed_time > 300:  # 5分钟后清理
-    #                 expired_ids.append(request_id)
-
-    #     # 移除过期的上下文
-    #     for request_id in expired_ids:
-    #         self.remove_context(request_id)
-
-    #     if expired_ids:
-    #         self.logger.debug(f"清理了 {len(expired_ids)} 个过期上下文")
+            self.logger.error("回调执行失败 %s: %s", context_item.request_id, e)
+
+    def _cleanup_tick(self) -> None:
+        """清理定时器回调：清理过期的上下文并安排下一次清理"""
+        try:
+            self._cleanup_expired_contexts()
+        except Exception as e:
+            self.logger.error("清理上下文出错: %s", e)
+        finally:
+            if self._cleanup_handle is not None:
+                self._cleanup_handle = self._get_loop().call_later(
+                    self._cleanup_interval, self._cleanup_tick
+                )
+
+    def _mark_finished(self, context_item: ContextItem) -> None:
+        """记录已结束的上下文，供清理时按结束顺序移除"""
+        self._completed_fifo.append((context_item._finished, context_item.request_id))
+
+    def _cleanup_expired_contexts(self) -> None:
+        """清理过期的上下文（等待中的上下文由超时定时器处理）
+
+        已结束的上下文按结束顺序排在 FIFO 中，只需从队头弹出
+        超过保留时间的项，无需扫描全部上下文。
+        """
+        # 整轮清理只读取一次时钟
+        deadline = self._get_loop().time() - self._completed_retention
+        fifo = self._completed_fifo
+        removed = 0
+
+        while fifo and fifo[0][0] < deadline:
+            _, request_id = fifo.popleft()
+            # 上下文可能已被手动移除，或 request_id 被新的请求复用
+            context_item = self._contexts.get(request_id)
+            if (
+                context_item is not None
+                and context_item.status != RequestStatus.PENDING
+            ):
+                self.remove_context(request_id)
+                removed += 1
+
+        if removed:
+            self.logger.debug("清理了 %d 个过期上下文", removed)
 
 
 # 便捷的装饰器和工具函数
@@ -12,7 +12,13 @@ class EnvironmentClient(BaseClient):
     """
 
     def __init__(
-        self, env_id: str, hub_url: str, metadata: Optional[Dict[str, Any]] = None
+        self,
+        env_id: str,
+        hub_url: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1,
+        batch_window_us: int = 500,
+        receive_concurrency: int = 1,
     ):
         # 环境客户端ID格式：env_{env_id}
         client_id = f"{env_id}"
@@ -23,6 +29,9 @@ class EnvironmentClient(BaseClient):
             hub_url=hub_url,
             env_id=env_id,
             metadata=metadata,
+            batch_size=batch_size,
+            batch_window_us=batch_window_us,
+            receive_concurrency=receive_concurrency,
         )
         self.env_id = env_id
 
@@ -17,6 +17,9 @@ class HumanClient(BaseClient):
         hub_url: str,
         env_id: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1,
+        batch_window_us: int = 500,
+        receive_concurrency: int = 1,
     ):
         super().__init__(
             client_id=human_id,
@@ -24,6 +27,9 @@ class HumanClient(BaseClient):
             hub_url=hub_url,
             env_id=env_id,
             metadata=metadata,
+            batch_size=batch_size,
+            batch_window_us=batch_window_us,
+            receive_concurrency=receive_concurrency,
         )
 
     def _get_client_identity(self) -> dict:
@@ -1,22 +1,69 @@
 """Hub 连接管理器"""
 
 import asyncio
+import logging
 import websockets
-from typing import Dict, Optional, Set
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
 from ..protocol import Envelope, ClientInfo, ClientType
 from ..utils import get_logger
 
+# 不存在的索引返回的共享空字典（只通过只读视图暴露）
+_EMPTY_INDEX: Dict[str, "Connection"] = {}
+
 
 class Connection:
-    """客户端连接"""
+    """客户端连接
+
+    每个连接有独立的发送队列和写入任务：发送方只需入队，不会被慢客户端阻塞。
+    send_envelope/send_text 返回 True 只表示消息已加入发送队列，不表示已送达；
+    队列已满时消息被丢弃，计入 dropped 并记录日志。
+    """
+
+    __slots__ = (
+        "websocket",
+        "client_info",
+        "connected",
+        "last_heartbeat",
+        "_tx",
+        "_writer",
+        "_loop",
+        "_logger",
+        "_on_lost",
+        "dropped",
+    )
 
     def __init__(
-        self, websocket: websockets.WebSocketServerProtocol, client_info: ClientInfo
+        self,
+        websocket: websockets.WebSocketServerProtocol,
+        client_info: ClientInfo,
+        queue_size: int = 1024,
+        logger: Optional[logging.Logger] = None,
+        on_lost: Optional[Callable[["Connection"], None]] = None,
     ):
+        """
+        Args:
+            websocket: WebSocket 连接
+            client_info: 客户端信息
+            queue_size: 发送队列长度上限
+            logger: 日志器
+            on_lost: 写入失败、连接失效后调用的回调（用于从管理器中移除连接）
+        """
         self.websocket = websocket
         self.client_info = client_info
         self.connected = True
-        self.last_heartbeat = asyncio.get_event_loop().time()
+        self._logger = logger or get_logger("star_protocol.hub.manager")
+        self._on_lost = on_lost
+        # 因发送队列已满或连接失效而丢弃的消息数
+        self.dropped = 0
+
+        # 缓存事件循环，心跳时间直接读取 loop.time()
+        self._loop = asyncio.get_running_loop()
+        self.last_heartbeat = self._loop.time()
+
+        # 发送队列和写入任务
+        self._tx: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._writer = self._loop.create_task(self._run_writer())
 
     async def send_envelope(self, envelope: Envelope) -> bool:
         """发送信封到客户端
@@ -25,22 +72,73 @@ class Connection:
             envelope: 要发送的信封
 
         Returns:
-            发送是否成功
+            是否成功加入发送队列（不等待实际写入，True 不表示已送达）
+        """
+        return await self.send_text(envelope.to_bytes())
+
+    async def send_text(self, text: Union[str, bytes]) -> bool:
+        """发送已序列化的信封文本到客户端
+
+        用于广播等场景：同一信封只序列化一次，再发送给多个客户端。
+        消息只加入发送队列，不等待实际写入，始终以文本帧发送。
+
+        Args:
+            text: 信封的 JSON 文本（str 或 UTF-8 字节）
+
+        Returns:
+            是否成功加入发送队列，连接已断开（包括写入任务已退出）
+            或队列已满（背压）时返回 False
         """
         if not self.connected:
             return False
 
         try:
-            json_str = envelope.to_json()
-            await self.websocket.send(json_str)
-            return True
-        except Exception:
-            self.connected = False
+            self._tx.put_nowait(text)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._logger.warning(
+                "客户端 %s 发送队列已满，丢弃消息（累计丢弃 %d 条）",
+                self.client_info.client_id,
+                self.dropped,
+            )
             return False
+        return True
+
+    async def _run_writer(self) -> None:
+        """写入循环：按入队顺序逐条发送队列中的消息
+
+        发送失败时记录日志、丢弃剩余消息并通过 on_lost 回调移除连接。
+        """
+        tx = self._tx
+        while True:
+            text = await tx.get()
+            try:
+                await self.websocket.send(text, text=True)
+            except Exception as e:
+                self.connected = False
+                dropped = 1 + tx.qsize()
+                while not tx.empty():
+                    tx.get_nowait()
+                self.dropped += dropped
+                self._logger.warning(
+                    "发送到客户端 %s 失败，丢弃 %d 条消息: %s",
+                    self.client_info.client_id,
+                    dropped,
+                    e,
+                )
+                if self._on_lost is not None:
+                    # 写入任务结束后再移除连接，避免在任务内部取消自身
+                    self._loop.call_soon(self._on_lost, self)
+                return
+
+    def close(self) -> None:
+        """关闭连接对象，停止写入任务"""
+        self.connected = False
+        self._writer.cancel()
 
     def update_heartbeat(self) -> None:
         """更新心跳时间"""
-        self.last_heartbeat = asyncio.get_event_loop().time()
+        self.last_heartbeat = self._loop.time()
 
 
 class ConnectionManager:
@@ -50,15 +148,25 @@ class ConnectionManager:
         # 连接映射：client_id -> Connection
         self._connections: Dict[str, Connection] = {}
 
-        # 类型索引：client_type -> Set[client_id]
-        self._type_index: Dict[ClientType, Set[str]] = {
-            ClientType.AGENT: set(),
-            ClientType.ENVIRONMENT: set(),
-            ClientType.HUMAN: set(),
+        # 类型索引：client_type -> {client_id: Connection}
+        # 索引直接保存连接对象，查询时无需再回查 _connections
+        self._type_index: Dict[ClientType, Dict[str, Connection]] = {
+            ClientType.AGENT: {},
+            ClientType.ENVIRONMENT: {},
+            ClientType.HUMAN: {},
         }
 
-        # 环境索引：env_id -> Set[client_id]
-        self._env_index: Dict[str, Set[str]] = {}
+        # 环境索引：env_id -> {client_id: Connection}
+        self._env_index: Dict[str, Dict[str, Connection]] = {}
+
+        # 环境版本号：env_id -> version，环境内连接变化时递增
+        self._env_version: Dict[str, int] = {}
+
+        # 广播目标缓存：(env_id, 排除的客户端类型) -> (version, 目标连接视图)
+        # 版本号不一致时在下次访问时重建
+        self._broadcast_cache: Dict[
+            Tuple[str, ClientType], Tuple[int, Mapping[str, Connection]]
+        ] = {}
 
         self.logger = get_logger("star_protocol.hub.manager")
 
@@ -78,25 +186,33 @@ class ConnectionManager:
 
         # 检查重复连接
         if client_id in self._connections:
-            self.logger.warning(f"客户端 {client_id} 已连接，拒绝重复连接")
+            self.logger.warning("客户端 %s 已连接，拒绝重复连接", client_id)
             return False
 
         # 创建连接对象
-        connection = Connection(websocket, client_info)
+        connection = Connection(
+            websocket,
+            client_info,
+            logger=self.logger,
+            on_lost=self._on_connection_lost,
+        )
 
         # 添加到连接映射
         self._connections[client_id] = connection
 
         # 添加到类型索引
-        self._type_index[client_info.client_type].add(client_id)
+        self._type_index[client_info.client_type][client_id] = connection
 
         # 添加到环境索引（如果有环境ID）
         if client_info.env_id:
             if client_info.env_id not in self._env_index:
-                self._env_index[client_info.env_id] = set()
-            self._env_index[client_info.env_id].add(client_id)
+                self._env_index[client_info.env_id] = {}
+            self._env_index[client_info.env_id][client_id] = connection
+            self._bump_env_version(client_info.env_id)
 
-        self.logger.info(f"客户端连接: {client_id} ({client_info.client_type.value})")
+        self.logger.info(
+            "客户端连接: %s (%s)", client_id, client_info.client_type.value
+        )
         return True
 
     def remove_connection(self, client_id: str) -> bool:
@@ -108,27 +224,59 @@ class ConnectionManager:
         Returns:
             是否移除成功
         """
-        if client_id not in self._connections:
-            return False
-
-        connection = self._connections[client_id]
-        client_info = connection.client_info
+        return self.remove_connections((client_id,)) == 1
 
-        # 从连接映射移除
-        del self._connections[client_id]
+    def remove_connections(self, client_ids: Iterable[str]) -> int:
+        """批量移除连接
 
-        # 从类型索引移除
-        self._type_index[client_info.client_type].discard(client_id)
+        每个受影响的环境只更新一次索引版本，并合并为一条日志。
 
-        # 从环境索引移除
-        if client_info.env_id and client_info.env_id in self._env_index:
-            self._env_index[client_info.env_id].discard(client_id)
-            # 如果环境没有客户端了，删除环境索引
-            if not self._env_index[client_info.env_id]:
-                del self._env_index[client_info.env_id]
+        Args:
+            client_ids: 客户端ID列表
 
-        self.logger.info(f"客户端断开: {client_id}")
-        return True
+        Returns:
+            实际移除的连接数
+        """
+        removed = []
+        touched_envs = set()
+
+        for client_id in client_ids:
+            # 从连接映射移除并停止写入任务
+            connection = self._connections.pop(client_id, None)
+            if connection is None:
+                continue
+            connection.close()
+            removed.append(client_id)
+
+            # 从类型索引移除
+            client_info = connection.client_info
+            self._type_index[client_info.client_type].pop(client_id, None)
+
+            # 从环境索引移除
+            env_id = client_info.env_id
+            if env_id and env_id in self._env_index:
+                self._env_index[env_id].pop(client_id, None)
+                touched_envs.add(env_id)
+
+        for env_id in touched_envs:
+            if self._env_index[env_id]:
+                self._bump_env_version(env_id)
+            else:
+                # 如果环境没有客户端了，删除环境索引和广播缓存
+                del self._env_index[env_id]
+                self._env_version.pop(env_id, None)
+                for client_type in ClientType:
+                    self._broadcast_cache.pop((env_id, client_type), None)
+
+        if removed:
+            self.logger.info("客户端断开: %s", ", ".join(removed))
+        return len(removed)
+
+    def _on_connection_lost(self, connection: Connection) -> None:
+        """连接写入失败后的回调：连接仍处于注册状态时将其移除"""
+        client_id = connection.client_info.client_id
+        if self._connections.get(client_id) is connection:
+            self.remove_connection(client_id)
 
     def get_connection(self, client_id: str) -> Optional[Connection]:
         """获取连接
@@ -141,45 +289,74 @@ class ConnectionManager:
         """
         return self._connections.get(client_id)
 
-    def get_connections_by_type(self, client_type: ClientType) -> Dict[str, Connection]:
+    def get_connections_by_type(
+        self, client_type: ClientType
+    ) -> Mapping[str, Connection]:
         """根据类型获取连接
 
         Args:
             client_type: 客户端类型
 
         Returns:
-            连接字典
+            连接字典的只读视图（随连接变化实时更新，需要快照时请调用 dict()）
         """
-        client_ids = self._type_index.get(client_type, set())
-        return {
-            client_id: self._connections[client_id]
-            for client_id in client_ids
-            if client_id in self._connections
-        }
+        return MappingProxyType(self._type_index.get(client_type, _EMPTY_INDEX))
 
-    def get_connections_by_env(self, env_id: str) -> Dict[str, Connection]:
+    def get_connections_by_env(self, env_id: str) -> Mapping[str, Connection]:
         """根据环境ID获取连接
 
         Args:
             env_id: 环境ID
 
         Returns:
-            连接字典
+            连接字典的只读视图（随连接变化实时更新，需要快照时请调用 dict()）
         """
-        client_ids = self._env_index.get(env_id, set())
-        return {
-            client_id: self._connections[client_id]
-            for client_id in client_ids
-            if client_id in self._connections
-        }
+        return MappingProxyType(self._env_index.get(env_id, _EMPTY_INDEX))
+
+    def get_broadcast_targets(
+        self, env_id: str, exclude_type: ClientType
+    ) -> Mapping[str, Connection]:
+        """获取同环境中除指定类型以外的连接
+
+        结果按环境版本号缓存，只有该环境的连接变化后才会重建。
 
-    def get_all_connections(self) -> Dict[str, Connection]:
+        Args:
+            env_id: 环境ID
+            exclude_type: 要排除的客户端类型
+
+        Returns:
+            目标连接字典的只读视图
+        """
+        version = self._env_version.get(env_id, 0)
+        key = (env_id, exclude_type)
+        cached = self._broadcast_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        targets = MappingProxyType(
+            {
+                client_id: conn
+                for client_id, conn in self._env_index.get(
+                    env_id, _EMPTY_INDEX
+                ).items()
+                if conn.client_info.client_type != exclude_type
+            }
+        )
+        self._broadcast_cache[key] = (version, targets)
+        return targets
+
+    def _bump_env_version(self, env_id: str) -> None:
+        """环境内连接发生变化，使该环境的广播目标缓存失效"""
+        self._env_version[env_id] = self._env_version.get(env_id, 0) + 1
+
+    def get_all_connections(self) -> Mapping[str, Connection]:
         """获取所有连接
 
         Returns:
-            所有连接的字典
+            所有连接字典的只读视图（随连接变化实时更新，
+            遍历过程中需要增删连接时请先调用 dict() 获取快照）
         """
-        return self._connections.copy()
+        return MappingProxyType(self._connections)
 
     def update_heartbeat(self, client_id: str) -> bool:
         """更新客户端心跳
@@ -1,6 +1,7 @@
 """Hub 消息路由器"""
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional
 from .manager import ConnectionManager, Connection
 from ..protocol import Envelope, EnvelopeType, MessageType, ClientType
 from ..protocol import ActionMessage, OutcomeMessage, EventMessage, StreamMessage
@@ -26,50 +27,54 @@ class MessageRouter:
         Returns:
             是否路由成功
         """
+        recipient = envelope.recipient
         try:
             # 更新发送者心跳
             sender_connection.update_heartbeat()
 
-            # 记录消息
+            # 记录消息（延迟格式化，未开启 DEBUG 时不产生字符串）
             self.logger.debug(
-                f"路由信封: {envelope.envelope_type.value} "
-                f"from {envelope.sender} "
-                f"to {envelope.recipient or 'broadcast'}"
+                "路由信封: %s from %s to %s",
+                envelope.envelope_type.value,
+                envelope.sender,
+                recipient or "broadcast",
             )
 
-            # 根据信封类型和接收者路由
-            if envelope.recipient and envelope.recipient != "broadcast":
-                # 点对点消息
-                return await self._route_to_specific_client(envelope)
-            else:
-                # 广播消息
-                return await self._route_broadcast(envelope)
+            # 点对点消息是最常见的情况，优先判断
+            if recipient and recipient != "broadcast":
+                return await self._route_to_specific_client(envelope, recipient)
+
+            # 广播消息
+            return await self._route_broadcast(envelope)
 
         except Exception as e:
-            self.logger.error(f"路由信封失败: {e}")
+            self.logger.error("路由信封失败: %s", e)
             return False
 
-    async def _route_to_specific_client(self, envelope: Envelope) -> bool:
+    async def _route_to_specific_client(
+        self, envelope: Envelope, recipient: str
+    ) -> bool:
         """路由到特定客户端
 
         Args:
             envelope: 信封
+            recipient: 接收者ID
 
         Returns:
             是否路由成功
         """
-        recipient = envelope.recipient
         connection = self.connection_manager.get_connection(recipient)
 
-        if not connection:
-            self.logger.warning(f"目标客户端不存在: {recipient}")
+        if connection is None:
+            self.logger.warning("目标客户端不存在: %s", recipient)
             return False
 
+        # 返回 True 表示已加入目标的发送队列；队列已满时由连接记录丢弃
         success = await connection.send_envelope(envelope)
-        if not success:
+        if not success and not connection.connected:
             # 连接已断开，清理连接
             self.connection_manager.remove_connection(recipient)
-            self.logger.warning(f"目标客户端连接已断开: {recipient}")
+            self.logger.warning("目标客户端连接已断开: %s", recipient)
 
         return success
 
@@ -89,29 +94,32 @@ class MessageRouter:
             self.logger.debug("没有广播目标")
             return False
 
-        # 发送给所有目标
+        # 只序列化一次，然后放入所有目标的发送队列（不发送给自己）
+        # 入队不会阻塞，实际写入由各连接的写入任务并发完成
+        payload = envelope.to_bytes()
+        sender = envelope.sender
         success_count = 0
         failed_clients = []
 
         for client_id, connection in target_connections.items():
-            # 不发送给自己
-            if client_id == envelope.sender:
+            if client_id == sender:
                 continue
 
-            success = await connection.send_envelope(envelope)
-            if success:
+            if await connection.send_text(payload):
                 success_count += 1
-            else:
+            elif not connection.connected:
                 failed_clients.append(client_id)
 
         # 清理失败的连接
-        for client_id in failed_clients:
-            self.connection_manager.remove_connection(client_id)
+        if failed_clients:
+            self.connection_manager.remove_connections(failed_clients)
 
-        self.logger.debug(f"广播完成: 成功 {success_count}，失败 {len(failed_clients)}")
+        self.logger.debug(
+            "广播完成: 成功 %d，失败 %d", success_count, len(failed_clients)
+        )
         return success_count > 0
 
-    def _get_broadcast_targets(self, envelope: Envelope) -> Dict[str, Connection]:
+    def _get_broadcast_targets(self, envelope: Envelope) -> Mapping[str, Connection]:
         """获取广播目标
 
         Args:
@@ -122,18 +130,18 @@ class MessageRouter:
         """
         # 对于心跳和错误信封，通常不需要广播
         if envelope.envelope_type in [EnvelopeType.HEARTBEAT, EnvelopeType.ERROR]:
-            return {}
+            return _NO_TARGETS
 
         # 对于消息信封，根据消息类型决定广播范围
         if envelope.envelope_type == EnvelopeType.MESSAGE:
             return self._get_message_broadcast_targets(envelope)
 
         # 默认不广播
-        return {}
+        return _NO_TARGETS
 
     def _get_message_broadcast_targets(
         self, envelope: Envelope
-    ) -> Dict[str, Connection]:
+    ) -> Mapping[str, Connection]:
         """获取消息广播目标
 
         Args:
@@ -147,59 +155,75 @@ class MessageRouter:
         sender_connection = self.connection_manager.get_connection(sender_id)
 
         if not sender_connection:
-            return {}
+            return _NO_TARGETS
 
+        # 缓存到局部变量，避免重复的属性查找
         sender_info = sender_connection.client_info
-
-        # 根据消息类型决定广播范围
-        if isinstance(message, EventMessage):
-            # 事件消息：根据发送者类型决定广播范围
-            if sender_info.client_type == ClientType.ENVIRONMENT:
-                # 环境事件：发送给同环境的所有客户端
-                if sender_info.env_id:
-                    return self.connection_manager.get_connections_by_env(
-                        sender_info.env_id
-                    )
-                else:
-                    # 没有环境ID，发送给所有客户端
-                    return self.connection_manager.get_all_connections()
-
-            elif sender_info.client_type == ClientType.HUMAN:
-                # 人类观察者事件：发送给所有客户端
-                return self.connection_manager.get_all_connections()
-
-            else:
-                # Agent 事件：发送给同环境的其他客户端
-                if sender_info.env_id:
-                    return self.connection_manager.get_connections_by_env(
-                        sender_info.env_id
-                    )
-
-        elif isinstance(message, StreamMessage):
-            # 流消息：根据发送者类型决定
-            if sender_info.client_type == ClientType.HUMAN:
-                # 人类流数据：发送给所有客户端
-                return self.connection_manager.get_all_connections()
-            elif sender_info.env_id:
-                # 其他流数据：发送给同环境客户端
-                return self.connection_manager.get_connections_by_env(
-                    sender_info.env_id
-                )
-
-        # ACTION 和 OUTCOME 消息通常是点对点的，不广播
-        # 但如果明确要求广播，则广播给同环境的客户端
-        elif isinstance(message, (ActionMessage, OutcomeMessage)):
-            if sender_info.env_id:
-                # 发送给同环境的其他类型客户端
-                env_connections = self.connection_manager.get_connections_by_env(
-                    sender_info.env_id
-                )
-                # 过滤掉同类型的客户端（避免 Agent 向 Agent 广播 ACTION）
-                return {
-                    client_id: conn
-                    for client_id, conn in env_connections.items()
-                    if conn.client_info.client_type != sender_info.client_type
-                }
-
-        # 默认不广播
-        return {}
+        sender_type = sender_info.client_type
+        env_id = sender_info.env_id
+
+        # 根据消息类型查表决定广播范围
+        handler = _BROADCAST_DISPATCH.get(type(message))
+        if handler is None:
+            # 默认不广播
+            return _NO_TARGETS
+        return handler(self, sender_type, env_id)
+
+    def _targets_event(
+        self, sender_type: ClientType, env_id: Optional[str]
+    ) -> Mapping[str, Connection]:
+        """事件消息的广播目标：根据发送者类型决定广播范围"""
+        if sender_type == ClientType.ENVIRONMENT:
+            # 环境事件：发送给同环境的所有客户端
+            if env_id:
+                return self.connection_manager.get_connections_by_env(env_id)
+            # 没有环境ID，发送给所有客户端
+            return self.connection_manager.get_all_connections()
+
+        if sender_type == ClientType.HUMAN:
+            # 人类观察者事件：发送给所有客户端
+            return self.connection_manager.get_all_connections()
+
+        # Agent 事件：发送给同环境的其他客户端
+        if env_id:
+            return self.connection_manager.get_connections_by_env(env_id)
+        return _NO_TARGETS
+
+    def _targets_stream(
+        self, sender_type: ClientType, env_id: Optional[str]
+    ) -> Mapping[str, Connection]:
+        """流消息的广播目标：根据发送者类型决定"""
+        if sender_type == ClientType.HUMAN:
+            # 人类流数据：发送给所有客户端
+            return self.connection_manager.get_all_connections()
+        if env_id:
+            # 其他流数据：发送给同环境客户端
+            return self.connection_manager.get_connections_by_env(env_id)
+        return _NO_TARGETS
+
+    def _targets_action_outcome(
+        self, sender_type: ClientType, env_id: Optional[str]
+    ) -> Mapping[str, Connection]:
+        """ACTION/OUTCOME 消息的广播目标
+
+        ACTION 和 OUTCOME 消息通常是点对点的，不广播，
+        但如果明确要求广播，则广播给同环境的其他类型客户端
+        （过滤掉同类型的客户端，避免 Agent 向 Agent 广播 ACTION）。
+        """
+        if env_id:
+            return self.connection_manager.get_broadcast_targets(env_id, sender_type)
+        return _NO_TARGETS
+
+
+# 没有广播目标时返回的共享空映射
+_NO_TARGETS: Mapping[str, Connection] = MappingProxyType({})
+
+# 消息类型 -> 广播目标计算方法，按 type(message) 查表代替 isinstance 链
+_BROADCAST_DISPATCH: Dict[
+    type, Callable[[MessageRouter, ClientType, Optional[str]], Mapping[str, Connection]]
+] = {
+    EventMessage: MessageRouter._targets_event,
+    StreamMessage: MessageRouter._targets_stream,
+    ActionMessage: MessageRouter._targets_action_outcome,
+    OutcomeMessage: MessageRouter._targets_action_outcome,
+}
@@ -76,24 +76,16 @@ class HubServer:
         self.running = False
 
         try:
-            # 首先断开所有客户端连接
-            connections = self.connection_manager.get_all_connections()
-            disconnect_tasks = []
+            # 首先断开所有客户端连接（取快照，随后会移除连接）
+            # 对已关闭的连接调用 close() 不会产生任何操作
+            connections = dict(self.connection_manager.get_all_connections())
+            disconnect_tasks = [
+                connection.websocket.close(code=1001, reason="Server shutdown")
+                for connection in connections.values()
+            ]
 
-            for client_id, connection in connections.items():
-                try:
-                    # 发送关闭消息给客户端
-                    if not connection.websocket.closed:
-                        disconnect_tasks.append(
-                            connection.websocket.close(
-                                code=1001, reason="Server shutdown"
-                            )
-                        )
-                except Exception as e:
-                    self.logger.debug(f"关闭客户端连接 {client_id} 失败: {e}")
-                finally:
-                    # 移除连接管理器中的连接
-                    self.connection_manager.remove_connection(client_id)
+            # 一次性移除连接管理器中的所有连接
+            self.connection_manager.remove_connections(connections)
 
             # 等待所有连接关闭
             if disconnect_tasks:
@@ -105,6 +97,10 @@ class HubServer:
                 await self.server.wait_closed()
                 self.server = None
 
+            # 写入剩余的指标并停止指标后台任务
+            if self._metrics_collector:
+                await self._metrics_collector.close()
+
             self.logger.info("Hub 服务器已停止")
 
         except Exception as e:
@@ -320,7 +316,7 @@ class HubServer:
                 if not self.running:
                     break
 
-                current_time = asyncio.get_event_loop().time()
+                current_time = asyncio.get_running_loop().time()
                 timeout_threshold = current_time - heartbeat_interval * 2
 
                 # 检查超时的连接
@@ -458,8 +454,11 @@ class HubServer:
                 message=event,
             )
 
-            await connection.websocket.send(envelope.to_json())
-            self.logger.info(f"已发送注册成功消息给客户端: {client_id}")
+            # send_envelope 只表示已加入发送队列，实际写入由连接的写入任务完成
+            if await connection.send_envelope(envelope):
+                self.logger.info(f"已发送注册成功消息给客户端: {client_id}")
+            else:
+                self.logger.warning(f"注册成功消息未能加入发送队列: {client_id}")
 
         except Exception as e:
             self.logger.error(f"发送注册成功消息失败: {e}")
@@ -482,8 +481,6 @@ class HubServer:
 
         if env_connection:
             try:
-                from ..protocol import EventMessage
-
                 event = EventMessage(
                     event="agent_joined",
                     data={
@@ -500,10 +497,13 @@ class HubServer:
                     message=event,
                 )
 
-                await env_connection.websocket.send(envelope.to_json())
-                self.logger.info(
-                    f"通知Environment {env_client_id} Agent {agent_info.client_id} 已加入"
-                )
+                if await env_connection.send_envelope(envelope):
+                    self.logger.info(
+                        f"通知Environment {env_client_id} "
+                        f"Agent {agent_info.client_id} 已加入"
+                    )
+                else:
+                    self.logger.warning(f"Agent 加入通知未能加入发送队列: {env_client_id}")
 
             except Exception as e:
                 self.logger.error(f"通知Environment失败: {e}")
@@ -1,23 +1,66 @@
 """Star Protocol 指标收集器"""
 
+import asyncio
+import os
+import sys
+from array import array
 import time
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from time import time_ns
+from types import MappingProxyType
+from collections import deque
+from functools import lru_cache
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+)
 from dataclasses import dataclass, field
 from ..protocol import Envelope, ClientInfo, MessageType, ClientType
 from ..utils import get_logger
 
+# 无接收者时使用的标签值
+_BROADCAST = sys.intern("broadcast")
 
-@dataclass
-class MetricPoint:
-    """指标数据点"""
+# 未提供标签时共享的空标签（只读，意外修改会直接报错）
+_EMPTY_LABELS: Mapping[str, str] = MappingProxyType({})
 
-    timestamp: float
+# 信封记录：(envelope_type, sender_id, recipient_id, timestamp, envelope_size)
+EnvelopeRecord = Tuple[str, str, Optional[str], float, int]
+
+
+@lru_cache(maxsize=256)
+def _labels_for(envelope_type: str, recipient_id: Optional[str]) -> Dict[str, str]:
+    """获取信封指标标签
+
+    相同的 (envelope_type, recipient) 共享同一个字典，调用方不应修改返回值。
+    """
+    return {
+        "envelope_type": envelope_type,
+        "recipient": recipient_id or _BROADCAST,
+    }
+
+
+class MetricPoint(NamedTuple):
+    """指标数据点
+
+    以命名元组存储，每个计数器/仪表/直方图最多保存 max_points 个数据点。
+    timestamp 为 time.time_ns() 的整数纳秒，导出时换算为秒。
+    """
+
+    timestamp: int
     value: Any
-    labels: Dict[str, str] = field(default_factory=dict)
+    labels: Mapping[str, str] = _EMPTY_LABELS
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionMetric:
     """连接指标"""
 
@@ -35,7 +78,7 @@ class ConnectionMetric:
         return time.time() - self.connected_at
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageMetric:
     """消息指标"""
 
@@ -44,189 +87,351 @@ class MessageMetric:
     recipient_id: Optional[str]
     timestamp: float
     envelope_size: int
+    # 指标标签，创建时计算一次
+    labels: Dict[str, str] = field(init=False)
+
+    def __post_init__(self):
+        self.labels = _labels_for(self.envelope_type, self.recipient_id)
 
-    @property
-    def labels(self) -> Dict[str, str]:
-        """指标标签"""
-        return {
-            "envelope_type": self.envelope_type,
-            "recipient": self.recipient_id or "broadcast",
-        }
 
+class MetricsBackend(Protocol):
+    """指标后端接口
 
-class MetricsBackend(ABC):
-    """指标后端抽象接口"""
+    结构化类型：实现全部方法的对象即可作为后端使用，无需继承。
+    record_envelope_fast 和 summarize_histogram 是可选方法：
+    显式继承时复用默认实现，未继承且未实现时收集器回退到 record_envelope，
+    直方图摘要返回 None。
+    """
 
-    @abstractmethod
     async def record_connection(self, metric: ConnectionMetric) -> None:
         """记录连接指标"""
-        pass
+        ...
 
-    @abstractmethod
     async def record_envelope(self, metric: MessageMetric) -> None:
         """记录信封指标"""
-        pass
+        ...
+
+    async def record_envelope_fast(
+        self,
+        envelope_type: str,
+        sender_id: str,
+        recipient_id: Optional[str],
+        timestamp: float,
+        envelope_size: int,
+    ) -> None:
+        """直接按字段记录信封指标
+
+        默认实现构造 MessageMetric 并调用 record_envelope，
+        后端可以覆盖此方法以避免创建中间对象。
+        """
+        await self.record_envelope(
+            MessageMetric(
+                envelope_type=envelope_type,
+                sender_id=sender_id,
+                recipient_id=recipient_id,
+                timestamp=timestamp,
+                envelope_size=envelope_size,
+            )
+        )
 
-    @abstractmethod
     async def record_counter(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录计数器指标"""
-        pass
+        ...
 
-    @abstractmethod
     async def record_gauge(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录仪表指标"""
-        pass
+        ...
 
-    @abstractmethod
     async def record_histogram(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录直方图指标"""
-        pass
+        ...
 
-    @abstractmethod
     async def export_metrics(self) -> Dict[str, Any]:
         """导出指标数据"""
-        pass
+        ...
+
+    def summarize_histogram(self, name: str) -> Optional[Dict[str, float]]:
+        """计算直方图摘要，后端不支持或没有数据时返回 None"""
+        return None
 
 
 class MemoryBackend(MetricsBackend):
     """内存后端实现"""
 
+    # 导出信封指标时每块处理的行数
+    EXPORT_TILE_SIZE = 1024
+
     def __init__(self, max_points: int = 10000):
         self.max_points = max_points
 
         # 存储各种指标
-        self.connections: List[ConnectionMetric] = []
-        self.envelopes: List[MessageMetric] = []
-        self.counters: Dict[str, List[MetricPoint]] = {}
-        self.gauges: Dict[str, List[MetricPoint]] = {}
-        self.histograms: Dict[str, List[MetricPoint]] = {}
+        # 使用 deque(maxlen) 限制存储数量，超出时自动丢弃最旧的数据点（O(1)）
+        self.connections: Deque[ConnectionMetric] = deque(maxlen=max_points)
+        self.counters: Dict[str, Deque[MetricPoint]] = {}
+        self.gauges: Dict[str, Deque[MetricPoint]] = {}
+        self.histograms: Dict[str, Deque[MetricPoint]] = {}
+
+        # 信封指标按列存储在预分配的环形缓冲区中，写入时不创建记录对象，
+        # 按列聚合（如 sum_envelope_bytes）只需顺序扫描一个连续数组
+        self._env_head = 0  # 累计写入条数，写入位置为 _env_head % max_points
+        self._env_ts = array("d", bytes(8 * max_points))
+        self._env_size = array("q", bytes(8 * max_points))
+        self._env_type = array("H", bytes(2 * max_points))
+        self._env_sender: List[Optional[str]] = [None] * max_points
+        self._env_recipient: List[Optional[str]] = [None] * max_points
+        # 信封类型字符串 <-> 编号
+        self._env_type_codes: Dict[str, int] = {}
+        self._env_type_names: List[str] = []
 
     async def record_connection(self, metric: ConnectionMetric) -> None:
         """记录连接指标"""
         self.connections.append(metric)
-        # 限制存储数量
-        if len(self.connections) > self.max_points:
-            self.connections.pop(0)
 
     async def record_envelope(self, metric: MessageMetric) -> None:
         """记录信封指标"""
-        self.envelopes.append(metric)
-        # 限制存储数量
-        if len(self.envelopes) > self.max_points:
-            self.envelopes.pop(0)
+        await self.record_envelope_fast(
+            metric.envelope_type,
+            metric.sender_id,
+            metric.recipient_id,
+            metric.timestamp,
+            metric.envelope_size,
+        )
+
+    async def record_envelope_fast(
+        self,
+        envelope_type: str,
+        sender_id: str,
+        recipient_id: Optional[str],
+        timestamp: float,
+        envelope_size: int,
+    ) -> None:
+        """直接按字段记录信封指标（写入列缓冲区）"""
+        capacity = self.max_points
+        if not capacity:
+            return
+
+        code = self._env_type_codes.get(envelope_type)
+        if code is None:
+            code = self._env_type_codes[envelope_type] = len(self._env_type_names)
+            self._env_type_names.append(envelope_type)
+
+        i = self._env_head % capacity
+        self._env_ts[i] = timestamp
+        self._env_size[i] = envelope_size
+        self._env_type[i] = code
+        self._env_sender[i] = sender_id
+        self._env_recipient[i] = recipient_id
+        self._env_head += 1
+
+    def _envelope_ranges(self, last_n: Optional[int] = None) -> List[Tuple[int, int]]:
+        """按时间顺序返回最近 last_n 条信封记录在列缓冲区中的下标区间
+
+        环形缓冲区回绕时返回两个区间，否则返回一个。
+        """
+        capacity = self.max_points
+        head = self._env_head
+        count = min(head, capacity)
+        if last_n is not None:
+            count = min(count, last_n)
+        if count <= 0:
+            return []
+
+        start = (head - count) % capacity
+        end = start + count
+        if end <= capacity:
+            return [(start, end)]
+        return [(start, capacity), (0, end - capacity)]
+
+    @property
+    def envelopes(self) -> List[MessageMetric]:
+        """按时间顺序返回信封指标列表（快照）"""
+        return [MessageMetric(*record) for record in self.envelope_records()]
+
+    def envelope_records(self) -> List[EnvelopeRecord]:
+        """按时间顺序返回信封记录元组列表（快照），直接读取列缓冲区"""
+        names = self._env_type_names
+        return [
+            (
+                names[self._env_type[i]],
+                self._env_sender[i],
+                self._env_recipient[i],
+                self._env_ts[i],
+                self._env_size[i],
+            )
+            for start, end in self._envelope_ranges()
+            for i in range(start, end)
+        ]
+
+    def sum_envelope_bytes(self, last_n: Optional[int] = None) -> int:
+        """统计最近 last_n 条（默认全部）信封的字节总数"""
+        sizes = self._env_size
+        ranges = self._envelope_ranges(last_n)
+        return sum(sum(sizes[start:end]) for start, end in ranges)
 
     async def record_counter(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录计数器指标"""
         if name not in self.counters:
-            self.counters[name] = []
+            self.counters[name] = deque(maxlen=self.max_points)
 
-        point = MetricPoint(timestamp=time.time(), value=value, labels=labels or {})
+        point = MetricPoint(
+            time_ns(), value, labels if labels is not None else _EMPTY_LABELS
+        )
         self.counters[name].append(point)
 
-        # 限制存储数量
-        if len(self.counters[name]) > self.max_points:
-            self.counters[name].pop(0)
-
     async def record_gauge(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录仪表指标"""
         if name not in self.gauges:
-            self.gauges[name] = []
+            self.gauges[name] = deque(maxlen=self.max_points)
 
-        point = MetricPoint(timestamp=time.time(), value=value, labels=labels or {})
+        point = MetricPoint(
+            time_ns(), value, labels if labels is not None else _EMPTY_LABELS
+        )
         self.gauges[name].append(point)
 
-        # 限制存储数量
-        if len(self.gauges[name]) > self.max_points:
-            self.gauges[name].pop(0)
-
     async def record_histogram(
         self, name: str, value: float, labels: Dict[str, str] = None
     ) -> None:
         """记录直方图指标"""
         if name not in self.histograms:
-            self.histograms[name] = []
+            self.histograms[name] = deque(maxlen=self.max_points)
 
-        point = MetricPoint(timestamp=time.time(), value=value, labels=labels or {})
+        point = MetricPoint(
+            time_ns(), value, labels if labels is not None else _EMPTY_LABELS
+        )
         self.histograms[name].append(point)
 
-        # 限制存储数量
-        if len(self.histograms[name]) > self.max_points:
-            self.histograms[name].pop(0)
+    def summarize_histogram(self, name: str) -> Optional[Dict[str, float]]:
+        """计算直方图摘要
+
+        Args:
+            name: 直方图名称
+
+        Returns:
+            包含 count/min/max/mean/p50/p95/p99 的字典，没有数据时返回 None
+        """
+        points = self.histograms.get(name)
+        if not points:
+            return None
+
+        values = sorted([point[1] for point in points])
+        count = len(values)
+        last = count - 1
+        return {
+            "count": count,
+            "min": values[0],
+            "max": values[last],
+            "mean": sum(values) / count,
+            "p50": values[last * 50 // 100],
+            "p95": values[last * 95 // 100],
+            "p99": values[last * 99 // 100],
+        }
+
+    def iter_connections(self) -> Iterator[Dict[str, Any]]:
+        """逐条生成连接指标的导出字典"""
+        for conn in self.connections:
+            yield {
+                "client_id": conn.client_id,
+                "client_type": conn.client_type.value,
+                "env_id": conn.env_id,
+                "connected_at": conn.connected_at,
+                "disconnected_at": conn.disconnected_at,
+                "duration": conn.duration,
+            }
+
+    def iter_envelopes(self) -> Iterator[Dict[str, Any]]:
+        """逐条生成信封指标的导出字典
+
+        按 EXPORT_TILE_SIZE 行分块，每块先依次切出各列，再按行组装，
+        每列只顺序扫描一次。
+        """
+        names = self._env_type_names
+        tile = self.EXPORT_TILE_SIZE
+        for start, end in self._envelope_ranges():
+            for lo in range(start, end, tile):
+                hi = min(lo + tile, end)
+                for envelope_type, sender_id, recipient_id, timestamp, size in zip(
+                    [names[code] for code in self._env_type[lo:hi]],
+                    self._env_sender[lo:hi],
+                    self._env_recipient[lo:hi],
+                    self._env_ts[lo:hi],
+                    self._env_size[lo:hi],
+                ):
+                    yield {
+                        "envelope_type": envelope_type,
+                        "sender_id": sender_id,
+                        "recipient_id": recipient_id,
+                        "timestamp": timestamp,
+                        "envelope_size": size,
+                    }
+
+    @staticmethod
+    def iter_points(points: Iterable[MetricPoint]) -> Iterator[Dict[str, Any]]:
+        """逐条生成数据点的导出字典"""
+        for timestamp, value, labels in points:
+            if labels is _EMPTY_LABELS:
+                labels = {}  # 只读视图不能直接序列化为 JSON
+            yield {"timestamp": timestamp / 1e9, "value": value, "labels": labels}
 
     async def export_metrics(self) -> Dict[str, Any]:
         """导出指标数据"""
+        iter_points = self.iter_points
         return {
-            "connections": [
-                {
-                    "client_id": conn.client_id,
-                    "client_type": conn.client_type.value,
-                    "env_id": conn.env_id,
-                    "connected_at": conn.connected_at,
-                    "disconnected_at": conn.disconnected_at,
-                    "duration": conn.duration,
-                }
-                for conn in self.connections
-            ],
-            "envelopes": [
-                {
-                    "envelope_type": env.envelope_type,
-                    "sender_id": env.sender_id,
-                    "recipient_id": env.recipient_id,
-                    "timestamp": env.timestamp,
-                    "envelope_size": env.envelope_size,
-                }
-                for env in self.envelopes
-            ],
+            "connections": list(self.iter_connections()),
+            "envelopes": list(self.iter_envelopes()),
             "counters": {
-                name: [
-                    {
-                        "timestamp": point.timestamp,
-                        "value": point.value,
-                        "labels": point.labels,
-                    }
-                    for point in points
-                ]
+                name: list(iter_points(points))
                 for name, points in self.counters.items()
             },
             "gauges": {
-                name: [
-                    {
-                        "timestamp": point.timestamp,
-                        "value": point.value,
-                        "labels": point.labels,
-                    }
-                    for point in points
-                ]
-                for name, points in self.gauges.items()
+                name: list(iter_points(points)) for name, points in self.gauges.items()
             },
             "histograms": {
-                name: [
-                    {
-                        "timestamp": point.timestamp,
-                        "value": point.value,
-                        "labels": point.labels,
-                    }
-                    for point in points
-                ]
+                name: list(iter_points(points))
                 for name, points in self.histograms.items()
             },
         }
 
 
-class MetricsCollector:
-    """指标收集器"""
+async def _noop_record(*args: Any, **kwargs: Any) -> None:
+    """收集器禁用时替换 record_* 方法的空操作"""
 
-    def __init__(self, backend: Optional[MetricsBackend] = None):
+
+class MetricsCollector:
+    """指标收集器
+
+    信封指标通过有界队列交给后台任务写入后端：record_envelope_* 只做入队，
+    不在消息热路径上等待后端；队列满时丢弃并计数。
+
+    禁用时 record_* 方法被替换为空操作，调用方无需额外判断。
+    默认是否启用由环境变量 STAR_PROTOCOL_METRICS 控制（设为 "0" 时禁用）。
+    """
+
+    # 待写入信封指标的队列容量
+    QUEUE_SIZE = 4096
+
+    # 禁用时替换为空操作的记录方法
+    _RECORD_METHODS = (
+        "record_client_connected",
+        "record_client_disconnected",
+        "record_envelope_sent",
+        "record_envelope_received",
+        "record_envelope_routed",
+        "record_custom_metric",
+    )
+
+    def __init__(
+        self, backend: Optional[MetricsBackend] = None, enabled: Optional[bool] = None
+    ):
         self.backend = backend or MemoryBackend()
         self.logger = get_logger("star_protocol.monitor")
 
@@ -235,6 +440,38 @@ class MetricsCollector:
         self._envelope_received_count = 0
         self._envelope_routed_count = 0
         self._active_connections = 0
+        self._dropped_count = 0
+
+        # 活跃连接索引：client_id -> ConnectionMetric，断开时 O(1) 查找
+        self._active_by_client: Dict[str, ConnectionMetric] = {}
+
+        # 信封指标队列：(kind, envelope_type, sender_id, recipient_id, timestamp,
+        # envelope_size)，由后台任务写入后端（首次记录时启动）
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._worker: Optional[asyncio.Task] = None
+
+        if enabled is None:
+            enabled = os.getenv("STAR_PROTOCOL_METRICS", "1") != "0"
+        self._enabled = True
+        if not enabled:
+            self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        """是否正在收集指标"""
+        return self._enabled
+
+    def enable(self) -> None:
+        """启用指标收集（恢复 record_* 方法）"""
+        self._enabled = True
+        for name in self._RECORD_METHODS:
+            self.__dict__.pop(name, None)
+
+    def disable(self) -> None:
+        """禁用指标收集（record_* 方法替换为空操作）"""
+        self._enabled = False
+        for name in self._RECORD_METHODS:
+            setattr(self, name, _noop_record)
 
     async def record_client_connected(self, client_info: ClientInfo) -> None:
         """记录客户端连接"""
@@ -246,6 +483,7 @@ class MetricsCollector:
         )
 
         await self.backend.record_connection(metric)
+        self._active_by_client[client_info.client_id] = metric
 
         self._active_connections += 1
         await self.backend.record_gauge("active_connections", self._active_connections)
@@ -261,11 +499,10 @@ class MetricsCollector:
 
     async def record_client_disconnected(self, client_id: str) -> None:
         """记录客户端断开连接"""
-        # 更新连接指标中的断开时间
-        for conn in self.backend.connections:
-            if conn.client_id == client_id and conn.disconnected_at is None:
-                conn.disconnected_at = time.time()
-                break
+        # 更新连接指标中的断开时间（后端保存的是同一个对象）
+        metric = self._active_by_client.pop(client_id, None)
+        if metric is not None:
+            metric.disconnected_at = time.time()
 
         self._active_connections = max(0, self._active_connections - 1)
         await self.backend.record_gauge("active_connections", self._active_connections)
@@ -274,56 +511,128 @@ class MetricsCollector:
 
         self.logger.debug(f"记录客户端断开: {client_id}")
 
-    async def record_envelope_sent(self, envelope: Envelope) -> None:
-        """记录发送的信封"""
-        metric = MessageMetric(
-            envelope_type=envelope.envelope_type.value,
-            sender_id=envelope.sender,
-            recipient_id=envelope.recipient,
-            timestamp=envelope.timestamp or time.time(),
-            envelope_size=len(envelope.to_json()),
-        )
-
-        await self.backend.record_envelope(metric)
+    async def record_envelope_sent(
+        self, envelope: Envelope, envelope_size: Optional[int] = None
+    ) -> None:
+        """记录发送的信封
 
+        Args:
+            envelope: 信封
+            envelope_size: 序列化后的字节数，为 None 时读取信封的序列化缓存
+        """
         self._envelope_sent_count += 1
-        await self.backend.record_counter("envelopes_sent_total", 1, metric.labels)
+        self._enqueue("sent", envelope, envelope_size)
 
-        await self.backend.record_histogram(
-            "envelope_size_bytes", metric.envelope_size, metric.labels
-        )
+    async def record_envelope_received(
+        self, envelope: Envelope, envelope_size: Optional[int] = None
+    ) -> None:
+        """记录接收的信封
 
-    async def record_envelope_received(self, envelope: Envelope) -> None:
-        """记录接收的信封"""
+        Args:
+            envelope: 信封
+            envelope_size: 原始帧的字节数；接收的信封没有序列化缓存，
+                调用方应传入，为 None 时会重新序列化计算
+        """
         self._envelope_received_count += 1
+        self._enqueue("received", envelope, envelope_size)
 
-        metric = MessageMetric(
-            envelope_type=envelope.envelope_type.value,
-            sender_id=envelope.sender,
-            recipient_id=envelope.recipient,
-            timestamp=envelope.timestamp or time.time(),
-            envelope_size=len(envelope.to_json()),
-        )
-
-        await self.backend.record_envelope(metric)
-
-        await self.backend.record_counter("envelopes_received_total", 1, metric.labels)
+    async def record_envelope_routed(
+        self, envelope: Envelope, envelope_size: Optional[int] = None
+    ) -> None:
+        """记录路由的信封
 
-    async def record_envelope_routed(self, envelope: Envelope) -> None:
-        """记录路由的信封"""
+        Args:
+            envelope: 信封
+            envelope_size: 序列化后的字节数，为 None 时读取信封的序列化缓存
+        """
         self._envelope_routed_count += 1
+        self._enqueue("routed", envelope, envelope_size)
 
-        metric = MessageMetric(
-            envelope_type=envelope.envelope_type.value,
-            sender_id=envelope.sender,
-            recipient_id=envelope.recipient,
-            timestamp=envelope.timestamp or time.time(),
-            envelope_size=len(envelope.to_json()),
-        )
+    def _enqueue(
+        self, kind: str, envelope: Envelope, envelope_size: Optional[int]
+    ) -> None:
+        """将信封指标记录加入队列，队列已满时丢弃
 
-        await self.backend.record_envelope(metric)
+        队列中只保存指标所需的字段，不持有信封本身。
+        """
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+        if self._queue.full():
+            self._dropped_count += 1
+            return
+
+        if envelope_size is None:
+            envelope_size = envelope.byte_size
+        self._queue.put_nowait(
+            (
+                kind,
+                envelope.envelope_type.value,
+                envelope.sender,
+                envelope.recipient,
+                envelope.timestamp or time.time(),
+                envelope_size,
+            )
+        )
 
-        await self.backend.record_counter("envelopes_routed_total", 1, metric.labels)
+    async def _drain(self) -> None:
+        """后台任务：从队列取出信封指标记录并写入后端"""
+        queue = self._queue
+        while True:
+            record = await queue.get()
+            try:
+                await self._record_envelope(*record)
+            except Exception as e:
+                self.logger.error(f"记录信封指标失败: {e}")
+            finally:
+                queue.task_done()
+
+    async def _record_envelope(
+        self,
+        kind: str,
+        envelope_type: str,
+        sender_id: str,
+        recipient_id: Optional[str],
+        timestamp: float,
+        envelope_size: int,
+    ) -> None:
+        """将一条信封指标记录写入后端"""
+        backend = self.backend
+        labels = _labels_for(envelope_type, recipient_id)
+
+        # 未继承 MetricsBackend 的后端可能没有实现 record_envelope_fast
+        record_fast = getattr(backend, "record_envelope_fast", None)
+        if record_fast is not None:
+            await record_fast(
+                envelope_type, sender_id, recipient_id, timestamp, envelope_size
+            )
+        else:
+            await backend.record_envelope(
+                MessageMetric(
+                    envelope_type=envelope_type,
+                    sender_id=sender_id,
+                    recipient_id=recipient_id,
+                    timestamp=timestamp,
+                    envelope_size=envelope_size,
+                )
+            )
+
+        await backend.record_counter(f"envelopes_{kind}_total", 1, labels)
+
+        if kind == "sent":
+            await backend.record_histogram("envelope_size_bytes", envelope_size, labels)
+
+    async def flush(self) -> None:
+        """等待队列中的信封指标全部写入后端"""
+        if self._worker is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """写入剩余的信封指标并停止后台任务"""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
 
     async def record_custom_metric(
         self, metric_type: str, name: str, value: float, labels: Dict[str, str] = None
@@ -346,9 +655,23 @@ class MetricsCollector:
             self.logger.warning(f"未知指标类型: {metric_type}")
 
     async def export_metrics(self) -> Dict[str, Any]:
-        """导出所有指标"""
+        """导出所有指标（先写入队列中尚未处理的信封指标）"""
+        await self.flush()
         return await self.backend.export_metrics()
 
+    async def summarize_histogram(self, name: str) -> Optional[Dict[str, float]]:
+        """获取直方图摘要（先写入队列中尚未处理的信封指标）
+
+        Args:
+            name: 直方图名称，例如 "envelope_size_bytes"
+
+        Returns:
+            直方图摘要字典，没有数据时返回 None
+        """
+        await self.flush()
+        summarize = getattr(self.backend, "summarize_histogram", None)
+        return summarize(name) if summarize is not None else None
+
     def get_summary(self) -> Dict[str, Any]:
         """获取指标摘要"""
         return {
@@ -356,4 +679,5 @@ class MetricsCollector:
             "envelopes_sent": self._envelope_sent_count,
             "envelopes_received": self._envelope_received_count,
             "envelopes_routed": self._envelope_routed_count,
+            "envelopes_dropped": self._dropped_count,
         }
@@ -1,11 +1,12 @@
 """简单监控实现"""
 
 import asyncio
-import json
+import os
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Any, BinaryIO, Dict, Iterable, Optional
 from .metrics import MetricsCollector, MetricsBackend, MemoryBackend
+from ..protocol.messages import _json_dumps as _dumps
 from ..utils import get_logger
 
 
@@ -17,6 +18,17 @@ class FileBackend(MetricsBackend):
         self.memory_backend = MemoryBackend()
         self.logger = get_logger("star_protocol.monitor.file")
 
+        # 记录和导出方法直接绑定到内存后端的方法，调用时不经过额外的转发
+        memory_backend = self.memory_backend
+        self.record_connection = memory_backend.record_connection
+        self.record_envelope = memory_backend.record_envelope
+        self.record_envelope_fast = memory_backend.record_envelope_fast
+        self.record_counter = memory_backend.record_counter
+        self.record_gauge = memory_backend.record_gauge
+        self.record_histogram = memory_backend.record_histogram
+        self.export_metrics = memory_backend.export_metrics
+        self.summarize_histogram = memory_backend.summarize_histogram
+
     # 代理属性访问到内存后端
     @property
     def connections(self):
@@ -26,6 +38,9 @@ class FileBackend(MetricsBackend):
     def envelopes(self):
         return self.memory_backend.envelopes
 
+    def envelope_records(self):
+        return self.memory_backend.envelope_records()
+
     @property
     def counters(self):
         return self.memory_backend.counters
@@ -38,49 +53,73 @@ class FileBackend(MetricsBackend):
     def histograms(self):
         return self.memory_backend.histograms
 
-    async def record_connection(self, metric) -> None:
-        await self.memory_backend.record_connection(metric)
-
-    async def record_envelope(self, metric) -> None:
-        await self.memory_backend.record_envelope(metric)
-
-    async def record_counter(
-        self, name: str, value: float, labels: Dict[str, str] = None
-    ) -> None:
-        await self.memory_backend.record_counter(name, value, labels)
+    async def save_to_file(self, durable: bool = False) -> None:
+        """保存指标到文件
 
-    async def record_gauge(
-        self, name: str, value: float, labels: Dict[str, str] = None
-    ) -> None:
-        await self.memory_backend.record_gauge(name, value, labels)
+        逐条序列化写入临时文件，完成后再原子替换目标文件，
+        写入过程中崩溃不会损坏已有的指标文件。
 
-    async def record_histogram(
-        self, name: str, value: float, labels: Dict[str, str] = None
-    ) -> None:
-        await self.memory_backend.record_histogram(name, value, labels)
-
-    async def export_metrics(self) -> Dict[str, Any]:
-        return await self.memory_backend.export_metrics()
-
-    async def save_to_file(self) -> None:
-        """保存指标到文件"""
+        Args:
+            durable: 是否在替换前调用 fsync 确保数据落盘
+        """
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
         try:
-            metrics = await self.export_metrics()
-
-            # 添加元数据
-            output = {"timestamp": time.time(), "version": "1.0", "metrics": metrics}
-
             # 确保目录存在
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # 写入文件
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+            with open(tmp_path, "wb") as f:
+                self._stream_to_file(f)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
 
             self.logger.debug(f"指标已保存到: {self.file_path}")
 
         except Exception as e:
             self.logger.error(f"保存指标文件失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _stream_to_file(self, f: BinaryIO) -> None:
+        """以流式方式写入 JSON 格式的指标数据
+
+        输出结构与 {"timestamp", "version", "metrics": export_metrics()} 相同。
+        """
+        backend = self.memory_backend
+        write = f.write
+
+        write(b'{"timestamp":%s,"version":"1.0","metrics":{' % _dumps(time.time()))
+
+        write(b'\n"connections":')
+        self._write_array(write, backend.iter_connections())
+        write(b',\n"envelopes":')
+        self._write_array(write, backend.iter_envelopes())
+
+        for section, store in (
+            ("counters", backend.counters),
+            ("gauges", backend.gauges),
+            ("histograms", backend.histograms),
+        ):
+            write(b',\n"%s":{' % section.encode())
+            for i, (name, points) in enumerate(list(store.items())):
+                if i:
+                    write(b",")
+                write(b"\n%s:" % _dumps(name))
+                self._write_array(write, backend.iter_points(points))
+            write(b"}")
+
+        write(b"}}\n")
+
+    @staticmethod
+    def _write_array(write, items: Iterable[Dict[str, Any]]) -> None:
+        """逐个元素写入 JSON 数组，每个元素占一行"""
+        write(b"[")
+        first = True
+        for item in items:
+            write(b"\n" if first else b",\n")
+            write(_dumps(item))
+            first = False
+        write(b"]")
 
 
 class SimpleMonitor:
@@ -170,6 +209,8 @@ class SimpleMonitor:
 
             # 文件输出
             if isinstance(self.backend, FileBackend):
+                # 先写入队列中尚未处理的信封指标
+                await self.collector.flush()
                 await self.backend.save_to_file()
 
         except Exception as e:
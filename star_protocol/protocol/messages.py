@@ -4,17 +4,81 @@
 所有消息都提供了内置的 JSON 序列化和反序列化方法。
 """
 
+import itertools
 import json
+import os
+import sys
 import time
-import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Union
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 from .types import EnvelopeType, MessageType, ClientType
 from .exceptions import SerializationException, ValidationException
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖（pip install star-protocol[fast]）
+    orjson = None
 
-@dataclass
+try:
+    import msgspec
+except ImportError:  # 未安装 orjson 时，如果已安装 msgspec 则使用其 JSON 编解码器
+    msgspec = None
+
+
+if orjson is not None:
+
+    def _json_dumps(obj: Any) -> bytes:
+        """序列化为 UTF-8 JSON 字节（orjson）"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+    # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+    _JSON_ENCODE_ERRORS = (TypeError, ValueError)
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+elif msgspec is not None:
+    # 编码器和解码器可重复使用，预先创建
+    _json_dumps = msgspec.json.Encoder().encode
+    _json_loads = msgspec.json.Decoder().decode
+    _JSON_ENCODE_ERRORS = (TypeError, ValueError, msgspec.EncodeError)
+    _JSON_DECODE_ERRORS = (msgspec.DecodeError,)
+
+else:
+    # 预先创建编码器：json.dumps 带非默认参数时每次调用都会新建 JSONEncoder
+    _json_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def _json_dumps(obj: Any) -> bytes:
+        """序列化为 UTF-8 JSON 字节（标准库 json）"""
+        return _json_encode(obj).encode("utf-8")
+
+    _json_loads = json.loads
+    _JSON_ENCODE_ERRORS = (TypeError, ValueError)
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+
+# 消息ID：进程级前缀 + 自增计数器，避免每条消息调用 uuid4（os.urandom）
+# 前缀包含进程号、启动时间和一次性随机数，不同进程/主机之间不会冲突
+_ID_PREFIX = f"{os.getpid():x}{int(time.time()):x}{os.urandom(4).hex()}"
+_ID_COUNTER = itertools.count(1)
+
+
+def _fast_id(prefix: str = "") -> str:
+    """生成进程内唯一的消息ID"""
+    return f"{prefix}{_ID_PREFIX}_{next(_ID_COUNTER):x}"
+
+
+def _intern(value: Any) -> Any:
+    """驻留客户端ID等重复出现的字符串
+
+    同一个 ID 会出现在大量消息中，驻留后所有消息共享同一个字符串对象，
+    作为字典键查找时也能直接命中身份比较。非字符串原样返回。
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class ClientInfo:
     """客户端信息"""
 
@@ -54,9 +118,9 @@ class ClientInfo:
         """
         try:
             return cls(
-                client_id=data["client_id"],
-                client_type=ClientType(data["client_type"]),
-                env_id=data.get("env_id"),
+                client_id=_intern(data["client_id"]),
+                client_type=ClientType.from_value(data["client_type"]),
+                env_id=_intern(data.get("env_id")),
                 metadata=data.get("metadata"),
             )
         except (KeyError, ValueError) as e:
@@ -66,7 +130,7 @@ class ClientInfo:
 # === 内层消息类型定义 ===
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionMessage:
     """动作消息"""
 
@@ -79,7 +143,7 @@ class ActionMessage:
         if self.parameters is None:
             self.parameters = {}
         if not self.action_id:
-            self.action_id = f"act_{str(uuid.uuid4())}"
+            self.action_id = _fast_id("act_")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -95,13 +159,13 @@ class ActionMessage:
             return cls(
                 action=data["action"],
                 action_id=data["action_id"],
-                parameters=data.get("parameters", {}),
+                parameters=data.get("parameters"),
             )
         except KeyError as e:
             raise ValidationException(f"Invalid ActionMessage format: {e}")
 
 
-@dataclass
+@dataclass(slots=True)
 class OutcomeMessage:
     """结果消息"""
 
@@ -129,13 +193,13 @@ class OutcomeMessage:
             return cls(
                 action_id=data["action_id"],
                 outcome=data["outcome"],
-                data=data.get("data", {}),
+                data=data.get("data"),
             )
         except KeyError as e:
             raise ValidationException(f"Invalid OutcomeMessage format: {e}")
 
 
-@dataclass
+@dataclass(slots=True)
 class EventMessage:
     """事件消息"""
 
@@ -148,7 +212,7 @@ class EventMessage:
         if self.data is None:
             self.data = {}
         if not self.event_id:
-            self.event_id = f"evt_{str(uuid.uuid4())}"
+            self.event_id = _fast_id("evt_")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -164,13 +228,13 @@ class EventMessage:
             return cls(
                 event=data["event"],
                 event_id=data["event_id"],
-                data=data.get("data", {}),
+                data=data.get("data"),
             )
         except KeyError as e:
             raise ValidationException(f"Invalid EventMessage format: {e}")
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamMessage:
     """数据流消息"""
 
@@ -200,13 +264,13 @@ class StreamMessage:
                 stream=data["stream"],
                 stream_id=data["stream_id"],
                 sequence=data["sequence"],
-                chunk=data.get("chunk", {}),
+                chunk=data.get("chunk"),
             )
         except KeyError as e:
             raise ValidationException(f"Invalid StreamMessage format: {e}")
 
 
-@dataclass
+@dataclass(slots=True)
 class RegistrationMessage:
     """客户端注册消息"""
 
@@ -229,9 +293,9 @@ class RegistrationMessage:
             raise ValidationException(f"Invalid RegistrationMessage format: {e}")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HeartbeatInfo:
-    """心跳信息"""
+    """心跳信息（不可变，可在多个信封间共享）"""
 
     status: str
     metrics: Optional[Dict[str, Any]] = None
@@ -255,6 +319,10 @@ class HeartbeatInfo:
             raise ValidationException(f"Invalid HeartbeatInfo format: {e}")
 
 
+# 心跳信封没有 message 字段时共享的默认心跳信息
+_ALIVE_HEARTBEAT = HeartbeatInfo(status="alive")
+
+
 # Union 类型定义
 Message = Union[
     ActionMessage,
@@ -266,7 +334,7 @@ Message = Union[
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorInfo:
     """错误信息"""
 
@@ -294,25 +362,29 @@ class ErrorInfo:
             raise ValidationException(f"Invalid ErrorInfo format: {e}")
 
 
+# message_type -> 反序列化方法，按类型查表代替 if/elif 链
+_MESSAGE_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Message]] = {
+    sys.intern("action"): ActionMessage.from_dict,
+    sys.intern("outcome"): OutcomeMessage.from_dict,
+    sys.intern("event"): EventMessage.from_dict,
+    sys.intern("stream"): StreamMessage.from_dict,
+    sys.intern("registration"): RegistrationMessage.from_dict,
+}
+
+
 def message_from_dict(data: Dict[str, Any]) -> Message:
     """从字典创建消息（工厂函数）"""
     message_type = data.get("message_type")
-
-    if message_type == "action":
-        return ActionMessage.from_dict(data)
-    elif message_type == "outcome":
-        return OutcomeMessage.from_dict(data)
-    elif message_type == "event":
-        return EventMessage.from_dict(data)
-    elif message_type == "stream":
-        return StreamMessage.from_dict(data)
-    elif message_type == "registration":
-        return RegistrationMessage.from_dict(data)
-    else:
+    try:
+        handler = _MESSAGE_DISPATCH.get(message_type)
+    except TypeError:  # message_type 不可哈希
+        handler = None
+    if handler is None:
         raise ValidationException(f"Unknown message_type: {message_type}")
+    return handler(data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Envelope:
     """Star Protocol 信封消息格式
 
@@ -325,11 +397,29 @@ class Envelope:
     message: Message  # 内层消息（使用message字段，不是payload）
     envelope_id: Optional[str] = None
     timestamp: Optional[float] = None
+    # to_bytes() 的结果缓存：转发、记录指标、广播时只序列化一次
+    # 信封序列化后应视为不可变
+    _cached_bytes: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # to_json() 的结果缓存
+    _json_cache: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
-        """初始化后处理"""
+        """初始化后处理：填充默认值并校验，构造完成的信封总是有效的"""
+        if not isinstance(self.envelope_type, EnvelopeType):
+            raise ValidationException("Invalid envelope_type")
+        if not self.sender or not isinstance(self.sender, str):
+            raise ValidationException("sender must be a non-empty string")
+        if not self.recipient or not isinstance(self.recipient, str):
+            raise ValidationException("recipient must be a non-empty string")
+        if self.message is None:
+            raise ValidationException("message cannot be None")
+
         if self.envelope_id is None:
-            self.envelope_id = str(uuid.uuid4())
+            self.envelope_id = _fast_id()
         if self.timestamp is None:
             self.timestamp = time.time()
 
@@ -342,7 +432,7 @@ class Envelope:
           "sender": "sender_id",
           "recipient": "recipient_id",
           "message": { 内层消息 },
-          "envelope_id": "uuid",
+          "envelope_id": "id",
           "timestamp": 1234567890
         }
         """
@@ -356,56 +446,157 @@ class Envelope:
         }
         return result
 
+    @classmethod
+    def batch(
+        cls,
+        messages: Iterable[Message],
+        envelope_type: EnvelopeType,
+        sender: str,
+        recipient: str,
+    ) -> List["Envelope"]:
+        """为一批消息创建信封
+
+        整批信封共享同一个时间戳，只读取一次时钟。
+
+        Args:
+            messages: 内层消息列表
+            envelope_type: 信封类型
+            sender: 发送者ID
+            recipient: 接收者ID
+
+        Returns:
+            信封列表，顺序与 messages 相同
+        """
+        now = time.time()
+        return [
+            cls(
+                envelope_type=envelope_type,
+                sender=sender,
+                recipient=recipient,
+                message=message,
+                timestamp=now,
+            )
+            for message in messages
+        ]
+
+    @staticmethod
+    def _message_from_dict(
+        envelope_type: EnvelopeType, data: Dict[str, Any]
+    ) -> Message:
+        """解析信封中的内层消息"""
+        # 心跳信封可能没有message字段
+        if envelope_type == EnvelopeType.HEARTBEAT:
+            # 所有心跳共享同一个默认的HeartbeatInfo，不为每条心跳创建对象
+            return _ALIVE_HEARTBEAT
+        # 其他信封类型需要message字段
+        return message_from_dict(data["message"])
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Envelope":
         """从字典反序列化"""
         try:
-            envelope_type = EnvelopeType(data["type"])
-
-            # 心跳信封可能没有message字段
-            if envelope_type == EnvelopeType.HEARTBEAT:
-                # 为心跳创建一个默认的HeartbeatInfo
-                message = HeartbeatInfo(status="alive")
-            else:
-                # 其他信封类型需要message字段
-                message = message_from_dict(data["message"])
-
+            envelope_type = EnvelopeType.from_value(data["type"])
             return cls(
                 envelope_type=envelope_type,
-                sender=data["sender"],
-                recipient=data["recipient"],
-                message=message,
+                sender=_intern(data["sender"]),
+                recipient=_intern(data["recipient"]),
+                message=cls._message_from_dict(envelope_type, data),
                 envelope_id=data.get("envelope_id"),
                 timestamp=data.get("timestamp"),
             )
         except (KeyError, ValueError) as e:
             raise ValidationException(f"Invalid Envelope format: {e}")
 
-    def to_json(self) -> str:
-        """序列化为JSON字符串"""
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "Envelope":
+        """从可信来源的字典反序列化
+
+        跳过 __post_init__ 中的校验，只用于已知格式正确的数据
+        （例如 Hub 转发的、已在 Hub 端校验过的信封）。内层消息仍会正常解析。
+
+        Args:
+            data: 信封字典
+
+        Returns:
+            Envelope 实例
+        """
         try:
-            return json.dumps(self.to_dict(), ensure_ascii=False)
-        except (TypeError, ValueError) as e:
-            raise SerializationException(f"Failed to serialize message: {e}")
+            envelope_type = EnvelopeType.from_value(data["type"])
+            envelope = object.__new__(cls)
+            envelope.envelope_type = envelope_type
+            envelope.sender = _intern(data["sender"])
+            envelope.recipient = _intern(data["recipient"])
+            envelope.message = cls._message_from_dict(envelope_type, data)
+        except (KeyError, ValueError) as e:
+            raise ValidationException(f"Invalid Envelope format: {e}")
+
+        envelope_id = data.get("envelope_id")
+        envelope.envelope_id = _fast_id() if envelope_id is None else envelope_id
+        timestamp = data.get("timestamp")
+        envelope.timestamp = time.time() if timestamp is None else timestamp
+        envelope._cached_bytes = None
+        envelope._json_cache = None
+        return envelope
+
+    def to_json(self) -> str:
+        """序列化为JSON字符串（结果会缓存在信封上）"""
+        text = self._json_cache
+        if text is None:
+            text = self._json_cache = self.to_bytes().decode("utf-8")
+        return text
+
+    @property
+    def byte_size(self) -> int:
+        """序列化后的 UTF-8 字节数"""
+        return len(self.to_bytes())
+
+    def to_bytes(self) -> bytes:
+        """序列化为 UTF-8 编码的 JSON 字节
+
+        可直接作为 WebSocket 文本帧发送（send(data, text=True)），
+        避免发送时再次编码。结果会缓存在信封上，重复调用不会重新序列化。
+        """
+        data = self._cached_bytes
+        if data is None:
+            try:
+                data = _json_dumps(self.to_dict())
+            except _JSON_ENCODE_ERRORS as e:
+                raise SerializationException(f"Failed to serialize message: {e}")
+            self._cached_bytes = data
+        return data
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Envelope":
-        """从JSON字符串反序列化"""
+    def from_json(
+        cls, json_str: Union[str, bytes], trusted: bool = False
+    ) -> "Envelope":
+        """从JSON字符串或 UTF-8 字节反序列化
+
+        Args:
+            json_str: JSON 文本或 UTF-8 字节
+            trusted: 数据是否来自可信来源，为 True 时使用 from_trusted_dict
+                跳过信封字段校验（客户端接收 Hub 转发的信封时使用）
+
+        Returns:
+            Envelope 实例
+        """
         try:
-            data = json.loads(json_str)
+            data = _json_loads(json_str)
+            if trusted:
+                return cls.from_trusted_dict(data)
             return cls.from_dict(data)
-        except json.JSONDecodeError as e:
+        except _JSON_DECODE_ERRORS as e:
             raise SerializationException(f"Invalid JSON format: {e}")
         except Exception as e:
             raise SerializationException(f"Failed to deserialize message: {e}")
 
     def validate(self) -> None:
-        """验证消息格式"""
-        if not isinstance(self.envelope_type, EnvelopeType):
-            raise ValidationException("Invalid envelope_type")
-        if not self.sender or not isinstance(self.sender, str):
-            raise ValidationException("sender must be a non-empty string")
-        if not self.recipient or not isinstance(self.recipient, str):
-            raise ValidationException("recipient must be a non-empty string")
-        if self.message is None:
-            raise ValidationException("message cannot be None")
+        """验证消息格式（已弃用）
+
+        校验已在构造时（__post_init__）完成，此方法不再做任何检查，
+        仅为兼容旧代码保留，将在后续版本中移除。
+        """
+        warnings.warn(
+            "Envelope.validate() 已弃用：信封在构造时已完成校验",
+            DeprecationWarning,
+            stacklevel=2,
+        )
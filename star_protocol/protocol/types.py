@@ -8,7 +8,33 @@ from enum import Enum
 from typing import Any, Dict
 
 
-class EnvelopeType(Enum):
+class _LookupEnum(Enum):
+    """支持按值快速查找成员的枚举基类
+
+    值到成员的映射在模块导入时预先构建，from_value 只做一次字典查找，
+    不经过 Enum 构造调用的元类分派。
+    """
+
+    @classmethod
+    def from_value(cls, value: Any):
+        """根据值获取枚举成员
+
+        Args:
+            value: 枚举值（如 "message"）
+
+        Returns:
+            对应的枚举成员
+
+        Raises:
+            ValueError: 值不是有效的枚举值
+        """
+        try:
+            return cls._value_lookup[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
+
+
+class EnvelopeType(_LookupEnum):
     """信封类型枚举
 
     定义了 Star Protocol 支持的所有信封类型。
@@ -19,7 +45,7 @@ class EnvelopeType(Enum):
     ERROR = "error"
 
 
-class MessageType(Enum):
+class MessageType(_LookupEnum):
     """消息类型枚举
 
     定义了 Star Protocol 支持的所有消息类型。
@@ -33,7 +59,7 @@ class MessageType(Enum):
     REGISTRATION = "registration"
 
 
-class ClientType(Enum):
+class ClientType(_LookupEnum):
     """客户端类型枚举
 
     定义了 Star Protocol 支持的客户端类型。
@@ -42,3 +68,9 @@ class ClientType(Enum):
     AGENT = "agent"
     ENVIRONMENT = "environment"
     HUMAN = "human"
+
+
+# 预先构建各枚举的 值 -> 成员 映射
+for _enum_cls in (EnvelopeType, MessageType, ClientType):
+    _enum_cls._value_lookup = {member.value: member for member in _enum_cls}
+del _enum_cls
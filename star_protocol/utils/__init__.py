@@ -6,19 +6,34 @@
 - 便捷函数 (configure_logging)
 """
 
-from .config import (
-    StarConfig,
-    # get_config,
-    # set_config,
-    # update_config,
-    # reset_config,
-)
-
-from .logger import (
-    get_logger,
+import importlib
+from typing import Any
+
+# 延迟导入（PEP 562）：首次访问时才导入对应子模块，
+# 导入 star_protocol.utils 本身不会加载 logging 处理器、rich 等依赖
+_LAZY = {
+    # 配置管理
+    "StarConfig": ".config",
+    # get_config, set_config, update_config, reset_config
+    # 日志系统
+    "get_logger": ".logger",
     # 便捷函数
-    configure_logging,
-)
+    "configure_logging": ".logger",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
+
 
 __all__ = [
     # 配置管理
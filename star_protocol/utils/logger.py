@@ -9,7 +9,6 @@ import sys
 from typing import Optional
 
 # from .config import get_config, update_config
-from rich.logging import RichHandler
 
 
 def configure_logging(
@@ -52,6 +51,8 @@ def configure_logging(
     # 创建格式器
     if enable_rich:
         try:
+            # 延迟导入 rich：只有启用 Rich 日志时才需要
+            from rich.logging import RichHandler
 
             # Rich 处理器
             rich_handler = RichHandler(
@@ -0,0 +1,79 @@
+"""监控指标测试"""
+
+import asyncio
+
+from star_protocol.monitor.metrics import MetricsCollector, MessageMetric
+from star_protocol.protocol import Envelope, EnvelopeType, EventMessage
+
+
+class PlainBackend:
+    """未继承 MetricsBackend、只实现基础方法的后端"""
+
+    def __init__(self):
+        self.envelopes = []
+        self.counters = []
+
+    async def record_connection(self, metric):
+        pass
+
+    async def record_envelope(self, metric):
+        self.envelopes.append(metric)
+
+    async def record_counter(self, name, value, labels=None):
+        self.counters.append(name)
+
+    async def record_gauge(self, name, value, labels=None):
+        pass
+
+    async def record_histogram(self, name, value, labels=None):
+        pass
+
+    async def export_metrics(self):
+        return {}
+
+
+def _envelope() -> Envelope:
+    return Envelope(
+        envelope_type=EnvelopeType.MESSAGE,
+        sender="agent_001",
+        recipient="env_001",
+        message=EventMessage(event="moved", data={"x": 1}),
+    )
+
+
+def test_non_inheriting_backend_records_envelopes():
+    async def run():
+        backend = PlainBackend()
+        collector = MetricsCollector(backend, enabled=True)
+        await collector.record_envelope_sent(_envelope())
+        await collector.record_envelope_received(_envelope())
+        await collector.flush()
+        summary = await collector.summarize_histogram("envelope_size_bytes")
+        await collector.close()
+        return backend, summary
+
+    backend, summary = asyncio.run(run())
+
+    assert len(backend.envelopes) == 2
+    assert all(isinstance(metric, MessageMetric) for metric in backend.envelopes)
+    assert backend.envelopes[0].sender_id == "agent_001"
+    assert backend.envelopes[0].envelope_size > 0
+    assert backend.counters == ["envelopes_sent_total", "envelopes_received_total"]
+    assert summary is None
+
+
+def test_received_envelope_uses_given_frame_size():
+    async def run():
+        backend = PlainBackend()
+        collector = MetricsCollector(backend, enabled=True)
+        await collector.record_envelope_received(_envelope(), 123)
+        queued = collector._queue.get_nowait()
+        collector._queue.task_done()
+        collector._queue.put_nowait(queued)
+        await collector.close()
+        return backend, queued
+
+    backend, queued = asyncio.run(run())
+
+    assert not any(isinstance(field, Envelope) for field in queued)
+    assert backend.envelopes[0].envelope_size == 123